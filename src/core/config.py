@@ -1,11 +1,13 @@
 """設定ファイルの読み込みとマージ"""
-import os
 import sys
 import yaml
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import argparse
 import re
 
+# libyamlが利用可能ならCローダーを使う（未インストール時は純Python実装）
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 class ConfigLoader:
     """設定ファイルの読み込みを管理"""
@@ -24,17 +26,17 @@ class ConfigLoader:
         config = {}
 
         if config_path:
-            # 明示的に指定されたファイルが存在しない場合はエラー
-            if not os.path.exists(config_path):
-                print(f"Error: Config file not found: {config_path}", file=sys.stderr)
-                sys.exit(1)
-            
+            # 存在確認はopen()に任せ、stat + openの二重アクセスを避ける
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    loaded_config = yaml.safe_load(f)
+                    loaded_config = yaml.load(f, Loader=_YamlLoader)
                     if loaded_config:
                         config = loaded_config
                         cls._print_config(config, config_path)
+            except FileNotFoundError:
+                # 明示的に指定されたファイルが存在しない場合はエラー
+                print(f"Error: Config file not found: {config_path}", file=sys.stderr)
+                sys.exit(1)
             except yaml.YAMLError as e:
                 print(f"Error: Invalid YAML in config file {config_path}: {e}", file=sys.stderr)
                 sys.exit(1)
@@ -122,24 +124,35 @@ class ConfigLoader:
 
         # Glob patterns (special handling)
         if args.glob is None and 'glob' in config:
-            glob_patterns = config['glob']
-            if isinstance(glob_patterns, str):
-                args.glob = [pattern.strip() for pattern in glob_patterns.split(',')]
-            elif isinstance(glob_patterns, list):
-                if all(isinstance(p, str) for p in glob_patterns):
-                    args.glob = glob_patterns
-                else:
-                    print("Warning: Invalid glob patterns in config file (must be strings)", file=sys.stderr)
+            glob_patterns = ConfigLoader._parse_patterns(config['glob'], 'glob')
+            if glob_patterns is not None:
+                args.glob = glob_patterns
 
         # Exclude patterns (special handling)
         if args.exclude is None and 'exclude' in config:
-            exclude_patterns = config['exclude']
-            if isinstance(exclude_patterns, str):
-                args.exclude = [pattern.strip() for pattern in exclude_patterns.split(',')]
-            elif isinstance(exclude_patterns, list):
-                if all(isinstance(p, str) for p in exclude_patterns):
-                    args.exclude = exclude_patterns
-                else:
-                    print("Warning: Invalid exclude patterns in config file (must be strings)", file=sys.stderr)
-
-        return args
\ No newline at end of file
+            exclude_patterns = ConfigLoader._parse_patterns(config['exclude'], 'exclude')
+            if exclude_patterns is not None:
+                args.exclude = exclude_patterns
+
+        return args
+
+    @staticmethod
+    def _parse_patterns(patterns: Any, name: str) -> Optional[List[str]]:
+        """
+        設定ファイルのパターン指定（カンマ区切り文字列またはリスト）を解析
+
+        Args:
+            patterns: 設定ファイルの値
+            name: 警告に表示するキー名
+
+        Returns:
+            パターンのリスト（不正な場合はNone）
+        """
+        if isinstance(patterns, str):
+            return [pattern.strip() for pattern in patterns.split(',')]
+        if isinstance(patterns, list):
+            # 最初の非文字列要素で打ち切り、警告は1回だけ出力
+            if all(isinstance(p, str) for p in patterns):
+                return patterns
+            print(f"Warning: Invalid {name} patterns in config file (must be strings)", file=sys.stderr)
+        return None
@@ -1,17 +1,147 @@
 """ファイルスキャナー"""
 import os
+import stat
 import sys
 import chardet
-from typing import List, Dict
+import codecs
+import mmap
+from functools import lru_cache
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, Optional, Tuple
 from filters.base import FileFilter
 
+# 含めるファイルの (パス, stat結果)
+_Included = List[Tuple[str, Optional[os.stat_result]]]
+
+# (含めるファイル, サブディレクトリのリスト, 統計のカウンタ)
+_DirResult = Tuple[_Included, List[str], List[int]]
+
+# 走査中の統計カウンタ（リスト）の添字と、get_statsで返すキー
+_SCANNED, _GLOB_FILTERED, _IGNORED, _INCLUDED = range(4)
+_STAT_KEYS = ('scanned', 'glob_filtered', 'ignored', 'included')
+
+# 行数カウント時の読み込み単位
+_READ_CHUNK_SIZE = 1024 * 1024
+
+# これより大きいファイルはmmapして行数を数える
+_MMAP_THRESHOLD = 1024 * 1024
+
+# 並列走査時に1タスクで行数を数えるファイル数
+_MEASURE_BATCH = 64
+
+# ASCIIテキストに現れるバイト（タブ・改行類と印字可能文字）
+_ASCII_TEXT_BYTES = bytes([9, 10, 11, 12, 13]) + bytes(range(0x20, 0x7f))
+
+# NULを含んでもテキストとみなすBOM（UTF-16/32）
+_WIDE_BOMS = (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# ディレクトリfd相対のscandir/stat/openが使えるか（POSIXのみ）
+_SUPPORTS_DIR_FD = (
+    os.scandir in os.supports_fd
+    and os.open in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+)
+
+
+class ScanResult(Sequence):
+    """
+    スキャン結果のファイル情報の並び
+
+    ファイルごとに辞書を持たず、パス・サイズ・行数を並列の配列で保持する。
+    要素を取り出したときに {'path', 'size', 'lines'} の辞書を組み立てるので、
+    呼び出し側はこれまで通りファイル情報の辞書のリストとして扱える
+    """
+
+    __slots__ = ('paths', 'sizes', 'lines')
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self.sizes = array('q')
+        self.lines = array('q')
+
+    def append(self, path: str, size: int, lines: int) -> None:
+        """ファイル情報を1件追加"""
+        self.paths.append(path)
+        self.sizes.append(size)
+        self.lines.append(lines)
+
+    @staticmethod
+    def columns(target_files) -> Tuple[List[str], Sequence, Sequence]:
+        """
+        ファイル情報の並びをパス・サイズ・行数の列に分ける
+
+        ScanResultなら保持している配列をそのまま返し、辞書のリストなら列を作る
+
+        Args:
+            target_files: ScanResultまたはファイル情報の辞書のリスト
+
+        Returns:
+            (パスのリスト, サイズの並び, 行数の並び)
+        """
+        if isinstance(target_files, ScanResult):
+            return target_files.paths, target_files.sizes, target_files.lines
+        return (
+            [f['path'] for f in target_files],
+            [f['size'] for f in target_files],
+            [f['lines'] for f in target_files],
+        )
+
+    def extend(self, other: 'ScanResult') -> None:
+        """別のスキャン結果を末尾に連結"""
+        self.paths.extend(other.paths)
+        self.sizes.extend(other.sizes)
+        self.lines.extend(other.lines)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {'path': self.paths[index], 'size': self.sizes[index], 'lines': self.lines[index]}
+
+    def __iter__(self):
+        for path, size, lines in zip(self.paths, self.sizes, self.lines):
+            yield {'path': path, 'size': size, 'lines': lines}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ScanResult, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ScanResult({list(self)!r})"
+
 
 class FileScanner:
     """ファイルスキャンと収集を管理"""
 
-    def __init__(self, filters: List[FileFilter], debug: bool = False):
+    def __init__(
+        self,
+        filters: List[FileFilter],
+        debug: bool = False,
+        max_workers: Optional[int] = None,
+        count_lines: bool = True,
+        ignored_dirs: Optional[FrozenSet[str]] = None
+    ):
+        """
+        Args:
+            filters: 適用するフィルタのリスト
+            debug: デバッグモード
+            max_workers: 走査に使うスレッド数（I/O待ちが主なのでCPU数より多め）
+            count_lines: 行数を数えるか（Falseならファイルを開かず、行数は-1）
+            ignored_dirs: 名前だけで除外するディレクトリ名の集合
+                （フィルタを通さず、降りる前に枝刈りする）
+        """
         self.filters = filters
         self.debug = debug
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.count_lines = count_lines
+        self.ignored_dirs = ignored_dirs or frozenset()
         # 統計情報
         self.stats = {
             'scanned': 0,
@@ -22,48 +152,179 @@ class FileScanner:
             'included': 0
         }
 
-    def scan(self, target_dir: str) -> List[Dict[str, any]]:
+    def scan(self, target_dir: str) -> ScanResult:
         """ディレクトリをスキャンしてファイル情報を収集"""
+        target_files = ScanResult()
+        counts = [0] * len(_STAT_KEYS)
+
+        if self.debug or self.max_workers <= 1:
+            # デバッグ出力の順序を保つため逐次走査
+            # 再帰の深さ制限を避けるため明示的なスタックで深さ優先に走査
+            pending = [target_dir]
+            while pending:
+                directory = pending.pop()
+                included, subdirs, stats = self._scan_directory(directory)
+                target_files.extend(self._measure_batch(directory, included))
+                self._add_counts(counts, stats)
+                pending.extend(reversed(subdirs))
+        else:
+            # NFSなど遅延の大きいファイルシステムでもstat/openの待ちを重ねられるよう
+            # サブディレクトリの走査と、ファイルの行数カウント（一定数ごと）を別々のタスクとして
+            # スレッドへ投入する。結果は逐次時と同じ順序で回収する
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = [executor.submit(self._scan_subtree, target_dir, executor)]
+                while pending:
+                    batches, children, stats = pending.pop().result()
+                    for batch in batches:
+                        target_files.extend(batch.result())
+                    self._add_counts(counts, stats)
+                    pending.extend(reversed(children))
+
+        self.stats = dict(zip(_STAT_KEYS, counts))
+        return target_files
+
+    def _scan_subtree(
+        self,
+        directory: str,
+        executor: ThreadPoolExecutor
+    ) -> Tuple[List[Future], List[Future], List[int]]:
+        """
+        ディレクトリを処理し、行数カウントとサブディレクトリの走査を続けて投入する
+
+        Returns:
+            (行数カウントのFutureのリスト, サブディレクトリ走査のFutureのリスト, 統計)
+        """
+        included, subdirs, stats = self._scan_directory(directory)
+        batches = [
+            executor.submit(self._measure_batch, directory, included[i:i + _MEASURE_BATCH])
+            for i in range(0, len(included), _MEASURE_BATCH)
+        ]
+        children = [executor.submit(self._scan_subtree, d, executor) for d in subdirs]
+        return batches, children, stats
+
+    @staticmethod
+    def _add_counts(counts: List[int], stats: List[int]) -> None:
+        """1ディレクトリ分の統計カウンタを加算"""
+        for i, count in enumerate(stats):
+            counts[i] += count
+
+    def _measure_batch(self, directory: str, included: _Included) -> ScanResult:
+        """
+        同じディレクトリ内のファイルのサイズと行数をまとめて取得
+
+        Args:
+            directory: ファイルが置かれたディレクトリ
+            included: 含めるファイルの (パス, stat結果) のリスト
+
+        Returns:
+            ファイル情報
+        """
+        result = ScanResult()
+        if not included:
+            return result
+
+        # ディレクトリのfdを開き、ファイルはfd相対で開く
+        # （深い階層でもカーネルが毎回フルパスを解決しなくて済む）
+        dir_fd = None
+        if self.count_lines and _SUPPORTS_DIR_FD:
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            except OSError:
+                pass
+
+        try:
+            for file_path, st in included:
+                size, lines = self._measure(file_path, st, dir_fd, self.count_lines)
+                result.append(file_path, size, lines)
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+        return result
+
+    def _scan_directory(self, directory: str) -> _DirResult:
+        """
+        1ディレクトリ分のエントリを処理する
+
+        os.scandirのDirEntryはreaddirで得た種別をキャッシュしているため、
+        ファイル/ディレクトリ判定のために追加のstatを発行しない。
+        スレッドから呼ばれるため共有状態は変更せず、結果を返す。
+        ファイルの中身は読まず、行数カウントは_measure_batchで行う
+
+        Args:
+            directory: 走査するディレクトリ
+
+        Returns:
+            (含めるファイルの (パス, stat結果) のリスト, サブディレクトリのリスト, 統計のカウンタ)
+        """
         target_files = []
-        self.stats = {
-            'scanned': 0,
-            'glob_filtered': 0,
-            'ignored': 0,
-            'included': 0
-        }
+        subdirs = []
+        # 辞書のキーをハッシュしないよう、添字でアクセスするリストで数える
+        stats = [0] * len(_STAT_KEYS)
 
-        for root, dirs, files in os.walk(target_dir, followlinks=False):
-            original_dirs = dirs[:]
-            dirs[:] = [d for d in dirs if self._should_include_dir(os.path.join(root, d))]
+        # ディレクトリのfdを開き、配下のstatをfd相対で行う
+        dir_fd = None
+        try:
+            if _SUPPORTS_DIR_FD:
+                dir_fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            with os.scandir(directory if dir_fd is None else dir_fd) as it:
+                entries = list(it)
+        except OSError:
+            # os.walkと同様、読めないディレクトリはスキップ
+            if dir_fd is not None:
+                os.close(dir_fd)
+            return target_files, subdirs, stats
 
-            if len(original_dirs) != len(dirs):
-                removed_count = len(original_dirs) - len(dirs)
-                self.stats['ignored'] += removed_count
+        debug = self.debug
+        ignored_dirs = self.ignored_dirs
+        # フィルタはディレクトリ単位でまとめて適用する（パス -> DirEntry）
+        candidates = {}
+        try:
+            for entry in entries:
+                # fdでscandirした場合entry.pathは名前のみなので、パスはここで1回だけ組み立て、
+                # フィルタ・ファイル情報・デバッグ出力で同じ文字列を使い回す
+                path = os.path.join(directory, entry.name)
 
-            for file in files:
-                file_path = os.path.join(root, file)
+                try:
+                    # os.walkと同様、リンク先がディレクトリならディレクトリとして扱う
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
 
-                if os.path.islink(file_path):
-                    if self.debug:
-                        print(f"[SKIPPED SYMLINK] {file_path}")
+                if is_dir:
+                    if entry.name in ignored_dirs:
+                        stats[_IGNORED] += 1
+                        if debug:
+                            print(f"[IGNORED DIR] {path}")
+                    elif not self._should_include_dir(path):
+                        stats[_IGNORED] += 1
+                    elif not entry.is_symlink():
+                        subdirs.append(path)
                     continue
 
-                self.stats['scanned'] += 1
-
-                filter_result = self._apply_filters(file_path)
-                if filter_result != 'included':
-                    if filter_result in self.stats:
-                        self.stats[filter_result] += 1
+                if entry.is_symlink():
+                    if debug:
+                        print(f"[SKIPPED SYMLINK] {path}")
                     continue
 
-                # テキスト判定を削除 - 全てのファイルを対象とする
-                file_info = self._get_file_info(file_path)
-                target_files.append(file_info)
-                self.stats['included'] += 1
-                if self.debug:
-                    print(f"[ADDED] {file_path}")
+                stats[_SCANNED] += 1
+                candidates[path] = entry
 
-        return target_files
+            # テキスト判定を削除 - 全てのファイルを対象とする
+            for path in self._filter_files(list(candidates), stats):
+                try:
+                    st = candidates[path].stat(follow_symlinks=False)
+                except OSError:
+                    st = None
+                target_files.append((path, st))
+                stats[_INCLUDED] += 1
+                if debug:
+                    print(f"[ADDED] {path}")
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+        return target_files, subdirs, stats
 
     def get_stats(self) -> Dict[str, int]:
         """
@@ -76,66 +337,226 @@ class FileScanner:
 
     def _should_include_dir(self, dir_path: str) -> bool:
         """ディレクトリを含めるべきか判定"""
+        # scandirでディレクトリと分かっているので、フィルタでの再確認を省く
         for filter_obj in self.filters:
-            if not filter_obj.should_include(dir_path):
+            if not filter_obj.should_include(dir_path, is_dir=True):
                 return False
         return True
 
-    def _apply_filters(self, file_path: str) -> str:
+    def _filter_files(self, paths: List[str], stats: List[int]) -> List[str]:
         """
-        フィルタを適用し、どのフィルタで除外されたか返す
+        フィルタを順にまとめて適用し、残ったファイルを返す
+
+        各ファイルは最初に除外したフィルタの種類で数える（1件ずつ判定した場合と同じ）
+
+        Args:
+            paths: ファイルパスのリスト
+            stats: 統計のカウンタ（除外した件数を加算する）
 
         Returns:
-            'included', 'glob_filtered', 'ignored', 'size_filtered' のいずれか
+            全フィルタを通過したファイルパスのリスト（元の順序）
         """
         for filter_obj in self.filters:
-            if not filter_obj.should_include(file_path):
+            if not paths:
+                break
+            kept = filter_obj.filter_paths(paths)
+            if len(kept) != len(paths):
                 # フィルタの種類を判定
-                filter_class = filter_obj.__class__.__name__
-                if filter_class == 'GlobFilter':
-                    return 'glob_filtered'
-                elif filter_class == 'IgnoreFilter':
-                    return 'ignored'
-                return 'ignored'  # デフォルト
-        return 'included'
+                if filter_obj.__class__.__name__ == 'GlobFilter':
+                    stats[_GLOB_FILTERED] += len(paths) - len(kept)
+                else:
+                    stats[_IGNORED] += len(paths) - len(kept)  # IgnoreFilter・その他
+            paths = kept
+        return paths
+
+    @staticmethod
+    def _is_text_file(file_path: str, st: Optional[os.stat_result] = None) -> bool:
+        """
+        ファイルがテキストファイルかどうか判定
+
+        Args:
+            file_path: ファイルパス
+            st: 取得済みのstat結果（指定時は通常ファイル以外を開かずに除外）
+
+        Returns:
+            テキストファイルの場合True（空ファイルはテキストとみなす）
+        """
+        if st is not None:
+            if not stat.S_ISREG(st.st_mode):
+                return False
+            if st.st_size == 0:
+                return True
+            # 変更のない（更新時刻・サイズが同じ）ファイルは前回の判定結果を再利用
+            return FileScanner._is_text_cached(file_path, st.st_mtime_ns, st.st_size)
+        return FileScanner._detect_text(file_path)
 
     @staticmethod
-    def _is_text_file(file_path: str) -> bool:
-        """ファイルがテキストファイルかどうか判定"""
+    @lru_cache(maxsize=8192)
+    def _is_text_cached(file_path: str, mtime_ns: int, size: int) -> bool:
+        """(パス, 更新時刻, サイズ) をキーに_detect_textの結果をキャッシュ"""
+        return FileScanner._detect_text(file_path)
+
+    @staticmethod
+    def _detect_text(file_path: str) -> bool:
+        """ファイルの先頭を読んでテキストかどうか判定"""
         try:
             with open(file_path, 'rb') as f:
                 raw_data = f.read(2048)
+            if not raw_data:
+                return True
+            # 純粋なASCIIテキストならchardetを通さずに判定（translateはCレベルの1パス）
+            if not raw_data.translate(None, _ASCII_TEXT_BYTES):
+                return True
+            # NULを含むものはバイナリ（UTF-16/32のBOM付きテキストを除く）
+            if b'\x00' in raw_data and not raw_data.startswith(_WIDE_BOMS):
+                return False
+            # UTF-8として読めればchardetを通さない（末尾で途切れた文字は許容）
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(raw_data, final=False)
+                return True
+            except UnicodeDecodeError:
+                pass
             result = chardet.detect(raw_data)
             encoding = result['encoding']
             if encoding:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    f.read(2048)
+                # 読み込み済みの先頭部分をそのままデコードして確認（再オープンしない）
+                # 末尾で途切れたマルチバイト文字はエラーにしない
+                codecs.getincrementaldecoder(encoding)().decode(raw_data, final=False)
                 return True
         except Exception:
             return False
         return False
 
     @staticmethod
-    def _get_file_info(file_path: str) -> Dict[str, any]:
-        """ファイル情報を取得"""
-        info = {
+    def _get_file_info(file_path: str, st: Optional[os.stat_result] = None) -> Dict[str, any]:
+        """
+        ファイル情報を取得
+
+        Args:
+            file_path: ファイルパス
+            st: 取得済みのstat結果（指定時はサイズ取得のstatを省略）
+
+        Returns:
+            ファイル情報の辞書
+        """
+        size, lines = FileScanner._measure(file_path, st)
+        return {
             'path': file_path,
-            'size': 0,
-            'lines': 0,
+            'size': size,
+            'lines': lines,
         }
 
+    @staticmethod
+    def _measure(
+        file_path: str,
+        st: Optional[os.stat_result] = None,
+        dir_fd: Optional[int] = None,
+        count_lines: bool = True
+    ) -> Tuple[int, int]:
+        """
+        ファイルのサイズと行数を取得
+
+        Args:
+            file_path: ファイルパス
+            st: 取得済みのstat結果（指定時はサイズ取得のstatを省略）
+            dir_fd: 親ディレクトリのfd（指定時はファイル名だけでfd相対に開く）
+            count_lines: Falseの場合はファイルを開かず、行数は-1とする
+
+        Returns:
+            (サイズ, 行数)。読めない場合は取得できた値まで（残りは0）
+        """
+        size = 0
+        lines = 0 if count_lines else -1
+
         try:
-            file_size = os.path.getsize(file_path)
-            info['size'] = file_size
+            if st is None:
+                # 親ディレクトリのfdがあればファイル名だけでfd相対にstatする
+                if dir_fd is not None:
+                    st = os.stat(os.path.basename(file_path), dir_fd=dir_fd)
+                else:
+                    st = os.stat(file_path)
+            size = st.st_size
 
             # 巨大ファイル（100MB以上）の場合は警告
-            if file_size > 100 * 1024 * 1024:
-                print(f"Warning: Large file detected ({file_path}, {file_size / (1024*1024):.1f}MB)", file=sys.stderr)
+            if size > 100 * 1024 * 1024:
+                print(f"Warning: Large file detected ({file_path}, {size / (1024*1024):.1f}MB)", file=sys.stderr)
                 print("         This may consume significant memory.", file=sys.stderr)
 
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                info['lines'] = sum(1 for _ in f)
+            # 空ファイルは開かない
+            if not count_lines or size == 0:
+                return size, lines
+
+            if dir_fd is not None:
+                fd = os.open(os.path.basename(file_path), os.O_RDONLY, dir_fd=dir_fd)
+                f = open(fd, 'rb', buffering=0)
+            else:
+                f = open(file_path, 'rb', buffering=0)
+            with f:
+                mm = FileScanner._map_large(f, size)
+                if mm is None:
+                    lines = FileScanner._count_lines(f)
+                else:
+                    with mm:
+                        lines = FileScanner._count_lines(mm)
         except Exception:
             pass
 
-        return info
\ No newline at end of file
+        return size, lines
+
+    @staticmethod
+    def _map_large(f, size: int) -> Optional[mmap.mmap]:
+        """
+        大きいファイルを読み取り専用でmmapする
+
+        ページキャッシュから直接読むため、readのたびにユーザー空間のバッファへ
+        コピーされない。mmapできない場合（特殊ファイルなど）はNoneを返す
+
+        Args:
+            f: バイナリモードで開いたファイル
+            size: ファイルサイズ
+
+        Returns:
+            mmapオブジェクト、または閾値以下・mmap不可の場合None
+        """
+        if size <= _MMAP_THRESHOLD:
+            return None
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+
+    @staticmethod
+    def _count_lines(f) -> int:
+        """
+        バイナリストリームの行数を数える
+
+        デコードせずにチャンク単位でbytes.countを使う。改行の扱いはテキストモード
+        （universal newlines）と同じで、\n・\r・\r\n をそれぞれ1つの改行とみなす
+
+        Args:
+            f: バイナリモードで開いたファイル（またはmmap）
+
+        Returns:
+            行数
+        """
+        lines = 0
+        last = b''
+        while True:
+            chunk = f.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines += chunk.count(b'\n')
+            if b'\r' in chunk:
+                lines += chunk.count(b'\r') - chunk.count(b'\r\n')
+            # チャンク境界で分断された \r\n は1つの改行として数える
+            if last == b'\r' and chunk[:1] == b'\n':
+                lines -= 1
+            last = chunk[-1:]
+
+        # 末尾が改行で終わらない最終行
+        if last and last not in (b'\n', b'\r'):
+            lines += 1
+        return lines
\ No newline at end of file
@@ -1,10 +1,15 @@
 """フィルタの基底クラス"""
+import os
 from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
 
 
 class FileFilter(ABC):
     """ファイルフィルタの抽象基底クラス"""
 
+    # サブクラスが__slots__を定義した場合にインスタンス辞書を持たないようにする
+    __slots__ = ()
+
     @abstractmethod
     def should_include(self, file_path: str, **kwargs) -> bool:
         """
@@ -17,4 +22,71 @@ class FileFilter(ABC):
         Returns:
             含める場合True
         """
-        pass
\ No newline at end of file
+        pass
+
+    def filter_paths(self, paths: Iterable[str]) -> List[str]:
+        """
+        複数のファイルをまとめて判定し、含めるものだけを返す
+
+        Args:
+            paths: ファイルパス（ディレクトリは含めない）
+
+        Returns:
+            含めるファイルパスのリスト（元の順序）
+        """
+        should_include = self.should_include
+        return [path for path in paths if should_include(path)]
+
+
+def base_prefix(base_dir: Optional[str]) -> Optional[str]:
+    """
+    relative_pathで使う、ベースディレクトリの前方一致用の文字列を作る
+
+    Args:
+        base_dir: ベースディレクトリ
+
+    Returns:
+        末尾に区切り文字を付けたベースディレクトリ（指定なしの場合None）
+    """
+    if not base_dir:
+        return None
+    return os.path.join(base_dir, '')
+
+
+def relative_path(path: str, base_dir: str, prefix: Optional[str]) -> Optional[str]:
+    """
+    ベースディレクトリからの相対パス（区切り文字は '/'）を求める
+
+    スキャナーが渡すパスはベースディレクトリに名前を連結しただけなので、
+    前方一致すれば切り出すだけで済む。'.'・'..'・連続した区切り文字を含むなど
+    正規化が必要な場合だけos.path.relpathを使う
+
+    Args:
+        path: 対象のパス
+        base_dir: ベースディレクトリ
+        prefix: base_prefix(base_dir)の結果
+
+    Returns:
+        相対パス（異なるドライブなどで相対パスが作れない場合None）
+    """
+    rel_path = None
+    if prefix is not None and path.startswith(prefix):
+        rel_path = path[len(prefix):]
+        sep = os.sep
+        wrapped = sep + rel_path + sep
+        if (not rel_path
+                or rel_path.startswith(sep)
+                or rel_path.endswith(sep)
+                or sep + sep in rel_path
+                or sep + '.' + sep in wrapped
+                or sep + '..' + sep in wrapped
+                or (os.altsep and os.altsep in rel_path)):
+            rel_path = None
+    if rel_path is None:
+        try:
+            rel_path = os.path.relpath(path, base_dir)
+        except ValueError:
+            return None
+    if os.sep != '/':
+        rel_path = rel_path.replace(os.sep, '/')
+    return rel_path
\ No newline at end of file
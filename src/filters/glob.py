@@ -1,8 +1,12 @@
 """Globパターンフィルタ"""
 import os
-import pathspec
-from typing import List, Optional
-from filters.base import FileFilter
+from typing import Iterable, List, Optional
+from filters.base import FileFilter, base_prefix, relative_path
+from filters.pattern_matcher import compile_patterns
+
+# 判定結果をキャッシュするパス数の上限（超えたら作り直す）
+_CACHE_SIZE = 65536
+
 
 class GlobFilter(FileFilter):
     """Globパターンに基づくフィルタ"""
@@ -16,15 +20,19 @@ class GlobFilter(FileFilter):
         """
         self.patterns = patterns or []
         self.base_dir = base_dir
+        self._base_prefix = base_prefix(base_dir)
         self.debug = debug
+        # パスごとの判定結果（スキャンとツリー表示で同じパスを何度も判定するため）
+        self._cache = {}
 
         # パターンが指定されていない場合は全てマッチ
         if not self.patterns:
             self.spec = None
         else:
-            # pathspecを使ってgitignore互換のマッチャーを作成
+            # gitignore互換のパターンを1つの正規表現にまとめたマッチャーを作成
+            # （同じパターンのフィルタ間ではコンパイル済みのものを共有）
             try:
-                self.spec = pathspec.PathSpec.from_lines('gitwildmatch', self.patterns)
+                self.spec = compile_patterns(tuple(self.patterns))
             except Exception as e:
                 raise ValueError(f"Invalid glob pattern: {e}")
 
@@ -34,6 +42,8 @@ class GlobFilter(FileFilter):
 
         Args:
             file_path: ファイルパス
+            is_dir: ディレクトリかどうか（scandirなどで種別が分かっている場合に
+                指定すると、os.path.isdirでの確認を省く）
 
         Returns:
             マッチする場合True（パターンが未指定の場合は常にTrue）
@@ -42,8 +52,58 @@ class GlobFilter(FileFilter):
         if self.spec is None:
             return True
 
+        is_dir = kwargs.get('is_dir')
+        if is_dir:
+            # ディレクトリの場合は常にTrue（中身をスキャンするため）
+            return True
+
+        # デバッグ時は判定ごとに出力するためキャッシュしない
+        if self.debug:
+            return self._should_include(file_path, is_dir)
+
+        try:
+            return self._cache[file_path]
+        except KeyError:
+            pass
+
+        result = self._should_include(file_path, is_dir)
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[file_path] = result
+        return result
+
+    def filter_paths(self, paths: Iterable[str]) -> List[str]:
+        """
+        複数のファイルをまとめて判定し、パターンにマッチするものだけを返す
+
+        呼び出し側がファイルだけを渡すため、ディレクトリの確認とキャッシュを省き、
+        相対パスへの変換と照合だけをループで行う
+
+        Args:
+            paths: ファイルパス（ディレクトリは含めない）
+
+        Returns:
+            マッチしたファイルパスのリスト（元の順序）
+        """
+        if self.spec is None:
+            return list(paths)
+        if self.debug:
+            return [path for path in paths if self._matches_pattern(path)]
+
+        base_dir = self.base_dir
+        prefix = self._base_prefix
+        match_file = self.spec.match_file
+        matched = []
+        for path in paths:
+            rel_path = relative_path(path, base_dir, prefix)
+            if rel_path is not None and match_file(rel_path):
+                matched.append(path)
+        return matched
+
+    def _should_include(self, file_path: str, is_dir: Optional[bool] = None) -> bool:
+        """キャッシュを使わずにshould_includeの判定を行う"""
         # ディレクトリの場合は常にTrue（中身をスキャンするため）
-        if os.path.isdir(file_path):
+        if is_dir is None and os.path.isdir(file_path):
             return True
 
         return self._matches_pattern(file_path)
@@ -62,17 +122,13 @@ class GlobFilter(FileFilter):
         Returns:
             マッチする場合True
         """
-        # 相対パスに変換
-        try:
-            rel_path = os.path.relpath(path, self.base_dir)
-        except ValueError:
+        # 相対パス（区切り文字は '/'）に変換
+        rel_path = relative_path(path, self.base_dir, self._base_prefix)
+        if rel_path is None:
             # 異なるドライブなどで相対パスが作れない場合
             return False
 
-        # Windowsパスの場合、スラッシュに変換
-        rel_path = rel_path.replace(os.sep, '/')
-
-        # pathspecでマッチング
+        # 全パターンを1回の正規表現照合で判定
         if self.spec.match_file(rel_path):
             if self.debug:
                 print(f"[GLOB MATCHED] {rel_path}")
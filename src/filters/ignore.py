@@ -1,8 +1,12 @@
 """除外パターンフィルタ（.gitignore完全互換）"""
 import os
-import pathspec
-from typing import List
-from filters.base import FileFilter
+from itertools import chain
+from typing import Iterable, List, Optional
+from filters.base import FileFilter, base_prefix, relative_path
+from filters.pattern_matcher import compile_patterns
+
+# 判定結果をキャッシュするパス数の上限（超えたら作り直す）
+_CACHE_SIZE = 65536
 
 class IgnoreFilter(FileFilter):
     """除外パターンに基づくフィルタ（gitignore互換）"""
@@ -18,6 +22,13 @@ class IgnoreFilter(FileFilter):
         '.gitmodules',
     ]
 
+    # VCS_PATTERNSのうちディレクトリのもの（否定されていなければ名前だけで判定でき、
+    # スキャナーが降りる前に枝刈りする）
+    VCS_DIRS = frozenset(p.rstrip('/') for p in VCS_PATTERNS if p.endswith('/'))
+
+    # should_includeは走査中の全パスで呼ばれるため、属性を固定してインスタンス辞書を持たない
+    __slots__ = ('patterns', 'base_dir', '_base_prefix', 'debug', '_cache', 'spec', 'prunable_dirs')
+
     def __init__(self, patterns: List[str], base_dir: str, debug: bool = False, auto_vcs_ignore: bool = False):
         """
         Args:
@@ -28,18 +39,37 @@ class IgnoreFilter(FileFilter):
         """
         self.patterns = patterns
         self.base_dir = base_dir
+        self._base_prefix = base_prefix(base_dir)
         self.debug = debug
+        # パスごとの判定結果（スキャンとツリー表示で同じパスを何度も判定するため）
+        self._cache = {}
 
         # VCS自動除外が有効な場合、パターンに追加
         if auto_vcs_ignore:
-            combined_patterns = self.VCS_PATTERNS + patterns
+            # ユーザーのパターン（.gitignoreの '.git/' など）と重複するものは、前にある方を
+            # 除いても判定は変わらない（同じパターンなら後ろの方が必ず後勝ちになる）
+            combined_patterns = list(dict.fromkeys(reversed(self.VCS_PATTERNS + patterns)))
+            combined_patterns.reverse()
+            # ユーザーの否定パターン（'!.svn/' など）で戻される可能性のあるVCSディレクトリは、
+            # 名前だけで枝刈りせずにフィルタで判定する（ワイルドカードを含む否定も同様に扱う）
+            negations = [p[1:] for p in patterns if p.startswith('!')]
+            self.prunable_dirs = frozenset(
+                name for name in self.VCS_DIRS
+                if not any(name in p or any(c in p for c in '*?[') for p in negations)
+            )
             if self.debug:
                 print(f"[DEBUG] Auto-ignoring VCS files/directories: {self.VCS_PATTERNS}")
         else:
             combined_patterns = patterns
+            self.prunable_dirs = frozenset()
 
-        # pathspecを使ってgitignore互換のマッチャーを作成
-        self.spec = pathspec.PathSpec.from_lines('gitwildmatch', combined_patterns)
+        # パターンがない場合は何も除外しないので、マッチャーを作らない
+        if not any(combined_patterns):
+            self.spec = None
+        else:
+            # gitignore互換のパターンを1つの正規表現にまとめたマッチャーを作成
+            # （同じパターンのフィルタ間ではコンパイル済みのものを共有）
+            self.spec = compile_patterns(tuple(combined_patterns))
 
     def should_include(self, file_path: str, **kwargs) -> bool:
         """
@@ -47,40 +77,93 @@ class IgnoreFilter(FileFilter):
 
         Args:
             file_path: ファイルパス
+            is_dir: ディレクトリかどうか（scandirやstatで種別が分かっている場合に
+                指定すると、os.path.isdirでの確認を省く）
 
         Returns:
             含める場合True（除外パターンにマッチしない場合）
         """
-        return not self._is_ignored(file_path)
+        # パターンが指定されていない場合は全て含める
+        if self.spec is None:
+            return True
+
+        is_dir = kwargs.get('is_dir')
+
+        # デバッグ時は判定ごとに出力するためキャッシュしない
+        if self.debug:
+            return not self._is_ignored(file_path, is_dir)
+
+        try:
+            return self._cache[file_path]
+        except KeyError:
+            pass
+
+        result = not self._is_ignored(file_path, is_dir)
+        if len(self._cache) >= _CACHE_SIZE:
+            self._cache.clear()
+        self._cache[file_path] = result
+        return result
+
+    def filter_paths(self, paths: Iterable[str]) -> List[str]:
+        """
+        複数のファイルをまとめて判定し、除外パターンにマッチしないものだけを返す
+
+        呼び出し側がファイルだけを渡すため、ディレクトリとしての再判定とキャッシュを省き、
+        相対パスへの変換と照合だけをループで行う
+
+        Args:
+            paths: ファイルパス（ディレクトリは含めない）
 
-    def _is_ignored(self, path: str) -> bool:
+        Returns:
+            含めるファイルパスのリスト（元の順序）
+        """
+        if self.spec is None:
+            return list(paths)
+        if self.debug:
+            return super().filter_paths(paths)
+
+        base_dir = self.base_dir
+        prefix = self._base_prefix
+        match_file = self.spec.match_file
+        included = []
+        for path in paths:
+            rel_path = relative_path(path, base_dir, prefix)
+            # 異なるドライブなどで相対パスが作れない場合は除外しない
+            if rel_path is None or not match_file(rel_path):
+                included.append(path)
+        return included
+
+    def is_active(self) -> bool:
+        """除外パターンが有効かどうか"""
+        return self.spec is not None
+
+    def _is_ignored(self, path: str, is_dir: Optional[bool] = None) -> bool:
         """
         指定されたパスが除外パターンにマッチするかチェック
 
         Args:
             path: チェック対象のパス
+            is_dir: ディレクトリかどうか（Noneの場合はファイルシステムで確認）
 
         Returns:
             除外対象の場合True
         """
-        # 相対パスに変換
-        try:
-            rel_path = os.path.relpath(path, self.base_dir)
-        except ValueError:
+        # 相対パス（区切り文字は '/'）に変換
+        rel_path = relative_path(path, self.base_dir, self._base_prefix)
+        if rel_path is None:
             # 異なるドライブなどで相対パスが作れない場合
             return False
 
-        # Windowsパスの場合、スラッシュに変換
-        rel_path = rel_path.replace(os.sep, '/')
-
-        # pathspecでマッチング
+        # 全パターンを1回の正規表現照合で判定
         if self.spec.match_file(rel_path):
             if self.debug:
                 print(f"[IGNORED] {rel_path}")
             return True
 
         # ディレクトリの場合、末尾にスラッシュを付けてもう一度チェック
-        if os.path.isdir(path):
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        if is_dir:
             if self.spec.match_file(rel_path + '/'):
                 if self.debug:
                     print(f"[IGNORED DIR] {rel_path}/")
@@ -99,14 +182,25 @@ class IgnoreFilter(FileFilter):
         Returns:
             除外パターンのリスト
         """
+        if not ignore_file_path:
+            return []
+        try:
+            # 1回の読み込みでファイル全体を取得し、行ごとのファイル読み込みを避ける
+            with open(ignore_file_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        content = data.decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+
         patterns = []
-        if ignore_file_path and os.path.exists(ignore_file_path):
-            with open(ignore_file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    # 空行とコメント行をスキップ
-                    if line and not line.startswith('#'):
-                        patterns.append(line)
+        for line in content.split('\n'):
+            line = line.strip()
+            # 空行とコメント行をスキップ
+            if line and not line.startswith('#'):
+                patterns.append(line)
         return patterns
 
     @staticmethod
@@ -136,9 +230,8 @@ class IgnoreFilter(FileFilter):
         Returns:
             マージされた除外パターンのリスト
         """
-        all_patterns = []
-        for file_path in file_paths:
-            if file_path:
-                patterns = IgnoreFilter.load_patterns(file_path)
-                all_patterns.extend(patterns)
-        return all_patterns
\ No newline at end of file
+        return list(chain.from_iterable(
+            IgnoreFilter.load_patterns(file_path)
+            for file_path in file_paths
+            if file_path
+        ))
\ No newline at end of file
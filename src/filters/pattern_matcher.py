@@ -0,0 +1,226 @@
+"""gitignore互換パターンの一括マッチャー"""
+import re
+import pathspec
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+
+# gitignore互換パターンのクラス
+_PATTERN_FACTORY = pathspec.util.lookup_pattern('gitwildmatch')
+
+# pathspecが生成する正規表現内の名前付きグループ（連結時に名前が衝突する）
+_NAMED_GROUP = re.compile(r'\(\?P<[^>]+>')
+
+# 正規表現の特殊文字（リテラルな先頭部分の抽出に使う）
+_REGEX_SPECIAL = set('.^$*+?{}[]()|')
+_QUANTIFIERS = set('*+?{')
+
+# 正規表現を使わずに判定できる単純なパターン（'*.log'・'node_modules'・'.git/' など）
+_EXTENSION_PATTERN = re.compile(r'\*(\.[A-Za-z0-9_]+)')
+_NAME_PATTERN = re.compile(r'(?!\.+$)[A-Za-z0-9_.\-]+')
+
+
+def _simple_patterns(
+    patterns: List[str]
+) -> Optional[Tuple[Tuple[str, ...], FrozenSet[str], FrozenSet[str]]]:
+    """
+    全パターンが拡張子（'*.ext'）・名前（メタ文字なし）・ディレクトリ名（'name/'）の
+    いずれかの場合に分類する
+
+    Args:
+        patterns: gitignore形式のパターンのリスト
+
+    Returns:
+        (拡張子のタプル, 名前の集合, ディレクトリ名の集合)
+        （それ以外のパターンを含む場合None）
+    """
+    suffixes = []
+    names = set()
+    dir_names = set()
+    for pattern in patterns:
+        if not pattern or pattern.startswith('#'):
+            continue
+        m = _EXTENSION_PATTERN.fullmatch(pattern)
+        if m:
+            suffixes.append(m.group(1))
+        elif _NAME_PATTERN.fullmatch(pattern):
+            names.add(pattern)
+        elif pattern.endswith('/') and _NAME_PATTERN.fullmatch(pattern[:-1]):
+            dir_names.add(pattern[:-1])
+        else:
+            return None
+    if not suffixes and not names and not dir_names:
+        return None
+    return tuple(suffixes), frozenset(names), frozenset(dir_names)
+
+
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str):
+    """
+    パターン1つをpathspecのパターンオブジェクトに変換してキャッシュする
+
+    変換結果は作成後に変更されないため、パターンの並びが異なるマッチャー間でも
+    共通するパターン（'*.log' など）のコンパイル結果を共有できる
+
+    Args:
+        pattern: gitignore形式のパターン（空文字列以外）
+
+    Returns:
+        pathspecのパターンオブジェクト
+    """
+    return _PATTERN_FACTORY(pattern)
+
+
+def _literal_prefix(regex: str) -> str:
+    """
+    先頭固定（^）の正規表現から、マッチする文字列が必ず始まるリテラル部分を取り出す
+
+    Args:
+        regex: 正規表現
+
+    Returns:
+        リテラルな先頭部分（先頭固定でない場合は空文字列）
+    """
+    if not regex.startswith('^'):
+        return ''
+    prefix = []
+    i = 1
+    while i < len(regex):
+        c = regex[i]
+        if c == '\\':
+            # エスケープされた記号はリテラル、\dや\bなどのクラス・アンカーで終了
+            if i + 1 < len(regex) and not regex[i + 1].isalnum():
+                prefix.append(regex[i + 1])
+                i += 2
+                continue
+            break
+        if c in _REGEX_SPECIAL:
+            # 直前の文字に量指定子が付く場合、その文字は必須ではない
+            if c in _QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+        prefix.append(c)
+        i += 1
+    return ''.join(prefix)
+
+
+class PatternMatcher:
+    """
+    gitignore互換パターンを1つの正規表現にまとめて照合する
+
+    pathspecはパターンごとに正規表現を評価するため、パターン数に比例して
+    Pythonレベルの呼び出しが増える。ここでは全パターンを逆順の選択肢として
+    1つの正規表現に連結し、1回の照合で「最後にマッチしたパターン」を求める
+    （gitignoreの後勝ちルールと同じ結果になる）。
+    """
+
+    def __init__(self, patterns: List[str]):
+        """
+        Args:
+            patterns: gitignore形式のパターンのリスト
+
+        Raises:
+            パターンが不正な場合はpathspecの例外をそのまま送出
+        """
+        # PathSpec.from_linesと同じく空行は除く
+        self.spec = pathspec.PathSpec([_compile_pattern(p) for p in patterns if p])
+
+        # 否定を含まない拡張子・名前・ディレクトリ名だけのパターンは、どの階層の名前にも
+        # マッチする（'*.log' は 'a/b.log' と 'x.log/' 配下、'.git/' は 'a/.git/' 配下）
+        # ので文字列操作で判定できる
+        simple = _simple_patterns(patterns)
+        if simple is not None:
+            suffixes, names, dir_names = simple
+            self._suffixes = suffixes
+            self._dir_suffixes = tuple(suffix + '/' for suffix in suffixes)
+            self._names = names
+            self._dir_names = dir_names
+        self._simple = simple is not None
+
+        compiled = [
+            (p.regex.pattern, p.include)
+            for p in self.spec.patterns
+            if p.include is not None
+        ]
+        # 含めるパターンが全て先頭固定のリテラル（'src/' など）を持つ場合、どれにも
+        # 前方一致しないパスは正規表現を評価せずに不一致と判定できる
+        # （除外パターンはマッチを打ち消すだけなので考慮しなくてよい）
+        prefixes = [_literal_prefix(regex) for regex, include in compiled if include]
+        self._prefixes = tuple(prefixes) if prefixes and all(prefixes) else None
+
+        self._includes = {}
+        alternatives = []
+        # 後勝ちにするため逆順に並べる（選択肢は先頭から順に試される）
+        for index, (regex, include) in enumerate(reversed(compiled)):
+            name = f'p{index}'
+            self._includes[name] = include
+            regex = _NAMED_GROUP.sub('(?:', regex)
+            if not regex.startswith('^'):
+                # pathspecは各パターンをsearchで照合するため、先頭に固定されていない
+                # パターンは任意の前置部分を許してmatchでも同じ結果にする
+                regex = '(?s:.*?)' + regex
+            alternatives.append(f'(?P<{name}>{regex})')
+
+        # 連結できない場合はpathspecの照合にフォールバック
+        self._match = None
+        if alternatives:
+            try:
+                self._match = re.compile('|'.join(alternatives)).match
+            except re.error:
+                pass
+
+    def match_file(self, rel_path: str) -> bool:
+        """
+        相対パス（区切り文字は '/'）がパターンにマッチするか判定
+
+        Args:
+            rel_path: ベースディレクトリからの相対パス
+
+        Returns:
+            マッチする（除外パターンで打ち消されていない）場合True
+        """
+        if self._simple:
+            return self._match_simple(rel_path)
+        if self._prefixes is not None and not rel_path.startswith(self._prefixes):
+            return False
+        if self._match is None:
+            return self.spec.match_file(rel_path)
+        m = self._match(rel_path)
+        return m is not None and self._includes[m.lastgroup]
+
+    def _match_simple(self, rel_path: str) -> bool:
+        """拡張子・名前・ディレクトリ名だけのパターンを正規表現を使わずに照合する"""
+        if self._suffixes:
+            if rel_path.endswith(self._suffixes):
+                return True
+            # 'x.log/...' のように、マッチしたディレクトリの配下
+            if '/' in rel_path:
+                for dir_suffix in self._dir_suffixes:
+                    if dir_suffix in rel_path:
+                        return True
+        parts = rel_path.split('/')
+        # 'a/b/' のような末尾の区切り文字は、最後の空要素として無視される
+        if self._names and not self._names.isdisjoint(parts):
+            return True
+        # ディレクトリ名は後ろに区切り文字が続く要素（最後の要素以外）とだけ照合する
+        if self._dir_names and '/' in rel_path:
+            parts.pop()
+            return not self._dir_names.isdisjoint(parts)
+        return False
+
+
+@lru_cache(maxsize=256)
+def compile_patterns(patterns: Tuple[str, ...]) -> PatternMatcher:
+    """
+    パターンの並びごとにPatternMatcherを作成してキャッシュする
+
+    PatternMatcherは作成後に状態を変えないため、同じパターンを使う
+    フィルタ間で共有できる（順序は後勝ちの判定に影響するので並べ替えない）
+
+    Args:
+        patterns: gitignore形式のパターンのタプル
+
+    Returns:
+        PatternMatcher
+    """
+    return PatternMatcher(list(patterns))
\ No newline at end of file
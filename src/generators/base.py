@@ -1,6 +1,34 @@
 """コンテンツジェネレータの基底クラス"""
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# head/tail指定時に読み進める単位
+_PARTIAL_READ_SIZE = 64 * 1024
+
+# ファイル読み込みの並列数の上限
+_MAX_READ_WORKERS = 32
+
+
+def _count_newlines(data: bytes) -> int:
+    """\n・\r・\r\n をそれぞれ1つの改行として数える"""
+    count = data.count(b'\n')
+    if b'\r' in data:
+        count += data.count(b'\r') - data.count(b'\r\n')
+    return count
+
+
+def _decode(data: bytes) -> str:
+    """open(encoding='utf-8', errors='ignore')と同じくデコードし、改行を \n に統一"""
+    content = data.decode('utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
 
 
 class ContentGenerator(ABC):
@@ -40,4 +68,205 @@ class ContentGenerator(ABC):
         Returns:
             (生成されたコンテンツ, サニタイズ統計)
         """
-        pass
\ No newline at end of file
+        pass
+
+    @staticmethod
+    def _read_file(file_path: str, size_hint: int = 0) -> str:
+        """
+        ファイルをUTF-8テキストとして読み込む
+
+        open().read()と同じ結果（デコードできないバイトは無視、改行は \n に統一）を、
+        スキャン時に取得済みのサイズで1回のos.readにまとめて得る
+
+        Args:
+            file_path: ファイルパス
+            size_hint: スキャン時のファイルサイズ（0以下なら不明）
+
+        Returns:
+            ファイルの内容
+        """
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            request = max(size_hint, 0) + 1
+            chunks = []
+            while True:
+                chunk = os.read(fd, request)
+                chunks.append(chunk)
+                # 要求より短ければ終端（スキャン後に伸びたファイルは読み続ける）
+                if len(chunk) < request:
+                    break
+                request = max(request, 64 * 1024)
+        finally:
+            os.close(fd)
+
+        return _decode(b''.join(chunks))
+
+    @staticmethod
+    def _read_head(file_path: str, head_lines: int) -> str:
+        """
+        先頭head_lines行を含む範囲だけを読み込む
+
+        返す文字列を '\n' で分割した先頭head_lines個は、ファイル全体を
+        読んだ場合と同じになる（それ以降は途中までの場合がある）
+
+        Args:
+            file_path: ファイルパス
+            head_lines: 必要な行数（0以下なら全体を読む）
+
+        Returns:
+            ファイルの先頭部分
+        """
+        if head_lines <= 0:
+            return ContentGenerator._read_file(file_path)
+
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            chunks = []
+            newlines = 0
+            while True:
+                chunk = os.read(fd, _PARTIAL_READ_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                # バイト列で数えた改行数は上限（無視されるバイトを挟んだ \r?\n は
+                # デコード後に1つになる）なので、足りたらデコードして確かめる
+                newlines += _count_newlines(chunk)
+                if newlines >= head_lines:
+                    content = _decode(b''.join(chunks))
+                    if content.count('\n') >= head_lines:
+                        return content
+        finally:
+            os.close(fd)
+
+        return _decode(b''.join(chunks))
+
+    @staticmethod
+    def _read_tail(file_path: str, tail_lines: int) -> str:
+        """
+        末尾tail_lines行を含む範囲だけを末尾から読み込む
+
+        返す文字列を '\n' で分割した末尾tail_lines個は、ファイル全体を
+        読んだ場合と同じになる（それより前は途中からの場合がある）
+
+        Args:
+            file_path: ファイルパス
+            tail_lines: 必要な行数（0以下なら全体を読む）
+
+        Returns:
+            ファイルの末尾部分
+        """
+        if tail_lines <= 0:
+            return ContentGenerator._read_file(file_path)
+
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            pos = os.lseek(fd, 0, os.SEEK_END)
+            chunks = []
+            newlines = 0
+            # 末尾からtail_lines個の改行が見つかれば、それより前は不要
+            while pos > 0:
+                size = min(_PARTIAL_READ_SIZE, pos)
+                pos -= size
+                os.lseek(fd, pos, os.SEEK_SET)
+                chunk = os.read(fd, size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                # バイト列で数えた改行数は上限なので、足りたらデコードして確かめる
+                newlines += _count_newlines(chunk)
+                if newlines >= tail_lines:
+                    content = _decode(b''.join(reversed(chunks)))
+                    if content.count('\n') >= tail_lines:
+                        return content
+        finally:
+            os.close(fd)
+
+        return _decode(b''.join(reversed(chunks)))
+
+    @classmethod
+    def _load_file(
+        cls,
+        file_path: str,
+        size_hint: int = 0,
+        head_lines: Optional[int] = None,
+        tail_lines: Optional[int] = None
+    ) -> str:
+        """
+        ファイルを読み込み、head/tail指定に従って切り詰める
+
+        Args:
+            file_path: ファイルパス
+            size_hint: スキャン時のファイルサイズ
+            head_lines: 先頭N行のみ
+            tail_lines: 末尾N行のみ
+
+        Returns:
+            出力するファイルの内容
+        """
+        # head/tail指定時は必要な範囲だけ読む
+        if head_lines is not None:
+            file_content = cls._read_head(file_path, head_lines)
+        elif tail_lines is not None:
+            file_content = cls._read_tail(file_path, tail_lines)
+        else:
+            file_content = cls._read_file(file_path, size_hint)
+
+        # head/tail 処理
+        if head_lines is not None:
+            lines = file_content.split('\n')[:head_lines]
+            file_content = '\n'.join(lines)
+            if len(lines) == head_lines and file_content:
+                file_content += "\n... (truncated)\n"
+        elif tail_lines is not None:
+            lines = file_content.split('\n')[-tail_lines:]
+            file_content = "... (truncated)\n" + '\n'.join(lines)
+
+        return file_content
+
+    def _iter_contents(
+        self,
+        target_files: List[Dict[str, any]],
+        head_lines: Optional[int] = None,
+        tail_lines: Optional[int] = None
+    ) -> Iterator[Tuple[Dict[str, any], Callable[[], str]]]:
+        """
+        ファイルを並列に読み込み、元の順序で返す
+
+        読み込みはI/O待ちが主でGILを手放すため、スレッドで先読みする。
+        サニタイズや出力の組み立ては呼び出し側で順番に行う。
+
+        Args:
+            target_files: ファイル情報のリスト
+            head_lines: 先頭N行のみ
+            tail_lines: 末尾N行のみ
+
+        Yields:
+            (ファイル情報, 内容を返す関数) 読み込みで発生した例外は関数の呼び出し時に送出される
+        """
+        loaders = [
+            partial(self._load_file, file_info['path'], file_info.get('size', 0),
+                    head_lines, tail_lines)
+            for file_info in target_files
+        ]
+        if len(loaders) <= 1:
+            yield from zip(target_files, loaders)
+            return
+
+        workers = min(_MAX_READ_WORKERS, len(loaders))
+        remaining = zip(target_files, loaders)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 先読みはワーカー数の2倍までに抑え、読み終えた内容を溜め込まない
+            pending = deque(
+                (file_info, executor.submit(loader))
+                for file_info, loader in islice(remaining, 2 * workers)
+            )
+            try:
+                while pending:
+                    file_info, future = pending.popleft()
+                    for next_info, next_loader in islice(remaining, 1):
+                        pending.append((next_info, executor.submit(next_loader)))
+                    yield file_info, future.result
+            finally:
+                # 途中で打ち切られた場合は未着手の読み込みを取り消す
+                for _, future in pending:
+                    future.cancel()
\ No newline at end of file
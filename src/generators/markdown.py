@@ -1,12 +1,14 @@
 """Markdown形式のジェネレータ"""
-import os
 import sys
 from typing import List, Dict, Tuple, Optional
 
 from generators.base import ContentGenerator
+from filters.base import base_prefix, relative_path
 from sanitizers.sanitizer import Sanitizer
 from utils.language_map import LanguageMapper
 from utils.format_utils import format_size
+from utils.statistics import Statistics
+from core.file_scanner import ScanResult
 
 
 class MarkdownGenerator(ContentGenerator):
@@ -56,8 +58,9 @@ class MarkdownGenerator(ContentGenerator):
 
         # サマリー統計
         if include_stats:
-            total_size = sum(f['size'] for f in target_files)
-            total_lines = sum(f['lines'] for f in target_files)
+            _, sizes, line_counts = ScanResult.columns(target_files)
+            total_size = sum(sizes)
+            total_lines = sum(line_counts)
 
             content_parts.append("## Summary\n\n")
             content_parts.append(f"- **Total files**: {len(target_files)}\n")
@@ -65,7 +68,7 @@ class MarkdownGenerator(ContentGenerator):
             content_parts.append(f"- **Total size**: {format_size(total_size)}\n\n")
 
             # 拡張子別の統計
-            ext_stats = self._calculate_extension_stats(target_files)
+            ext_stats = Statistics.by_extension(target_files)
             if ext_stats:
                 content_parts.append("### By Extension\n\n")
                 content_parts.append("| Extension | Files | Lines | Size |\n")
@@ -101,16 +104,14 @@ class MarkdownGenerator(ContentGenerator):
         # 各ファイルの内容
         if include_merge:
             content_parts.append("## Files\n\n")
+            prefix = base_prefix(target_dir)
 
-            for file_info in target_files:
+            for file_info, load in self._iter_contents(target_files, head_lines, tail_lines):
                 file_path = file_info['path']
 
                 # 指定ディレクトリをルートとした絶対パス風に変換
-                try:
-                    rel_path = os.path.relpath(file_path, target_dir)
-                    display_path = '/' + rel_path.replace(os.sep, '/')
-                except ValueError:
-                    display_path = file_path
+                rel_path = relative_path(file_path, target_dir, prefix)
+                display_path = file_path if rel_path is None else '/' + rel_path
 
                 language = LanguageMapper.get_language(file_path)
 
@@ -118,18 +119,7 @@ class MarkdownGenerator(ContentGenerator):
                 content_parts.append(f"### `{display_path}`\n\n")
 
                 try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        file_content = f.read()
-
-                    # head/tail 処理
-                    if head_lines is not None:
-                        lines = file_content.split('\n')[:head_lines]
-                        file_content = '\n'.join(lines)
-                        if len(lines) == head_lines and file_content:
-                            file_content += "\n... (truncated)\n"
-                    elif tail_lines is not None:
-                        lines = file_content.split('\n')[-tail_lines:]
-                        file_content = "... (truncated)\n" + '\n'.join(lines)
+                    file_content = load()
 
                     # サニタイズ
                     file_content, stats = sanitizer.sanitize(file_content)
@@ -152,16 +142,4 @@ class MarkdownGenerator(ContentGenerator):
                     content_parts.append(f"```text\n[Error reading {file_path}: {e}]\n```\n\n")
                     print(f"Warning: Failed to read {file_path}: {e}", file=sys.stderr)
 
-        return ''.join(content_parts), all_stats
-
-    def _calculate_extension_stats(self, target_files: List[Dict[str, any]]) -> Dict[str, Dict]:
-        """拡張子別の統計を計算"""
-        stats = {}
-        for file_info in target_files:
-            ext = os.path.splitext(file_info['path'])[1] or '(no extension)'
-            if ext not in stats:
-                stats[ext] = {'count': 0, 'lines': 0, 'size': 0}
-            stats[ext]['count'] += 1
-            stats[ext]['lines'] += file_info['lines']
-            stats[ext]['size'] += file_info['size']
-        return stats
\ No newline at end of file
+        return ''.join(content_parts), all_stats
\ No newline at end of file
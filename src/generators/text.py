@@ -4,6 +4,7 @@ import os
 from typing import List, Dict, Tuple, Optional
 
 from generators.base import ContentGenerator
+from filters.base import base_prefix, relative_path
 from sanitizers.sanitizer import Sanitizer
 from utils.statistics import Statistics
 from utils.format_utils import format_size
@@ -82,33 +83,23 @@ class TextGenerator(ContentGenerator):
         # ファイル結合
         if include_merge:
             # content_parts.append("=== Files ===\n\n")
-            for file_info in target_files:
+            prefix = base_prefix(target_dir)
+            for file_info, load in self._iter_contents(target_files, head_lines, tail_lines):
                 file_path = file_info['path']
 
                 # 指定ディレクトリをルートとした絶対パス風に変換
-                try:
-                    rel_path = os.path.relpath(file_path, target_dir)
-                    # パスの区切り文字を統一（Unixスタイル）
-                    display_path = '/' + rel_path.replace(os.sep, '/')
-                except ValueError:
+                # （区切り文字はUnixスタイルに統一される）
+                rel_path = relative_path(file_path, target_dir, prefix)
+                if rel_path is not None:
+                    display_path = '/' + rel_path
+                else:
                     # 異なるドライブなどで相対パスが作れない場合
                     display_path = file_path
 
                 content_parts.append(f"--- {display_path} ---\n")
 
                 try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        file_content = f.read()
-
-                    # head/tail 処理
-                    if head_lines is not None:
-                        lines = file_content.split('\n')[:head_lines]
-                        file_content = '\n'.join(lines)
-                        if len(lines) == head_lines and file_content:
-                            file_content += "\n... (truncated)\n"
-                    elif tail_lines is not None:
-                        lines = file_content.split('\n')[-tail_lines:]
-                        file_content = "... (truncated)\n" + '\n'.join(lines)
+                    file_content = load()
 
                     # サニタイズ
                     file_content, stats = sanitizer.sanitize(file_content)
@@ -231,7 +231,9 @@ def main():
     glob_filter = None
 
     glob_filter = GlobFilter(args.glob, args.target_dir, args.debug)
-    filters.append(glob_filter)
+    # パターン未指定のGlobFilterは全て含めるだけなので、スキャン時には適用しない
+    if glob_filter.is_active():
+        filters.append(glob_filter)
 
     ignore_patterns = []
     if ignore_files:
@@ -239,14 +241,18 @@ def main():
     if exclude_patterns:
         ignore_patterns.extend(exclude_patterns)
     
-    if ignore_patterns:
-        ignore_filter = IgnoreFilter(ignore_patterns, args.target_dir, args.debug, auto_vcs_ignore)
-        filters.append(ignore_filter)
-    else:
-        ignore_filter = IgnoreFilter([], args.target_dir, args.debug, auto_vcs_ignore)
+    ignore_filter = IgnoreFilter(ignore_patterns, args.target_dir, args.debug, auto_vcs_ignore)
+    # パターンのないIgnoreFilterは何も除外しないので、スキャン時には適用しない
+    if ignore_filter.is_active():
         filters.append(ignore_filter)
 
-    scanner = FileScanner(filters, args.debug)
+    # 行数は統計表示（--stats）でのみ使うため、それ以外では数えない
+    scanner = FileScanner(
+        filters,
+        args.debug,
+        count_lines=args.stats,
+        ignored_dirs=ignore_filter.prunable_dirs
+    )
 
     # ツリービルダー（tree オプションが指定されている場合のみ）
     tree_builder = None
@@ -1,13 +1,16 @@
 """ファイル拡張子から言語を判定"""
 import os
-from typing import Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
 
 class LanguageMapper:
     """拡張子からMarkdown用の言語名を取得"""
 
     # 拡張子と言語のマッピング
-    LANGUAGE_MAP: Dict[str, str] = {
+    # 判定結果をキャッシュするため、読み取り専用にしておく
+    LANGUAGE_MAP: Mapping[str, str] = MappingProxyType({
         # Python
         '.py': 'python',
         '.pyi': 'python',
@@ -96,10 +99,10 @@ class LanguageMapper:
         '.csv': 'csv',
         '.graphql': 'graphql',
         '.proto': 'protobuf',
-    }
+    })
 
     # 特殊なファイル名（拡張子なし）
-    SPECIAL_FILES: Dict[str, str] = {
+    SPECIAL_FILES: Mapping[str, str] = MappingProxyType({
         'dockerfile': 'dockerfile',
         'makefile': 'makefile',
         'rakefile': 'ruby',
@@ -112,7 +115,7 @@ class LanguageMapper:
         '.dockerignore': 'text',
         '.npmrc': 'text',
         '.editorconfig': 'ini',
-    }
+    })
 
     @classmethod
     def get_language(cls, file_path: str) -> str:
@@ -125,16 +128,31 @@ class LanguageMapper:
         Returns:
             Markdown用の言語名
         """
-        basename = os.path.basename(file_path).lower()
-
-        # 特殊なファイル名をチェック
-        if basename in cls.SPECIAL_FILES:
-            return cls.SPECIAL_FILES[basename]
-
-        # 拡張子で判定
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext in cls.LANGUAGE_MAP:
-            return cls.LANGUAGE_MAP[ext]
-
-        # 不明な場合は拡張子をそのまま使用（ドットを除く）
-        return ext[1:] if ext else 'text'
\ No newline at end of file
+        # 判定はファイル名だけで決まるので、同じ名前の結果は使い回す
+        return _language_for_name(os.path.basename(file_path).lower())
+
+
+@lru_cache(maxsize=4096)
+def _language_for_name(basename: str) -> str:
+    """
+    小文字化したファイル名から言語を判定
+
+    Args:
+        basename: 小文字化したファイル名
+
+    Returns:
+        Markdown用の言語名
+    """
+    # 特殊なファイル名をチェック
+    language = LanguageMapper.SPECIAL_FILES.get(basename)
+    if language is not None:
+        return language
+
+    # 拡張子で判定
+    ext = os.path.splitext(basename)[1]
+    language = LanguageMapper.LANGUAGE_MAP.get(ext)
+    if language is not None:
+        return language
+
+    # 不明な場合は拡張子をそのまま使用（ドットを除く）
+    return ext[1:] if ext else 'text'
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 from typing import List, Dict
 
+from core.file_scanner import ScanResult
 from utils.format_utils import format_size
 
 class Statistics:
@@ -17,27 +18,45 @@ class Statistics:
         Returns:
             統計情報の辞書
         """
+        # 合計は列ごとにまとめて計算（ScanResultなら配列をそのまま合計できる）
+        paths, sizes, line_counts = ScanResult.columns(target_files)
         stats = {
-            'total_files': len(target_files),
-            'total_size': sum(f['size'] for f in target_files),
-            'total_lines': sum(f['lines'] for f in target_files),
-            'by_extension': {},
+            'total_files': len(paths),
+            'total_size': sum(sizes),
+            'total_lines': sum(line_counts),
+            'by_extension': Statistics._aggregate_by_extension(paths, sizes, line_counts),
         }
 
-        for file_info in target_files:
-            ext = os.path.splitext(file_info['path'])[1] or '(no extension)'
-            if ext not in stats['by_extension']:
-                stats['by_extension'][ext] = {
-                    'count': 0,
-                    'size': 0,
-                    'lines': 0,
-                }
+        return stats
 
-            stats['by_extension'][ext]['count'] += 1
-            stats['by_extension'][ext]['size'] += file_info['size']
-            stats['by_extension'][ext]['lines'] += file_info['lines']
+    @staticmethod
+    def by_extension(target_files: List[Dict[str, any]]) -> Dict[str, Dict[str, int]]:
+        """
+        拡張子別の統計を計算
 
-        return stats
+        Args:
+            target_files: ファイル情報のリスト
+
+        Returns:
+            拡張子ごとの {'count', 'size', 'lines'} の辞書
+        """
+        return Statistics._aggregate_by_extension(*ScanResult.columns(target_files))
+
+    @staticmethod
+    def _aggregate_by_extension(paths, sizes, line_counts) -> Dict[str, Dict[str, int]]:
+        """パス・サイズ・行数の列から拡張子別の統計を1パスで集計"""
+        by_extension = {}
+        splitext = os.path.splitext
+        for path, size, lines in zip(paths, sizes, line_counts):
+            ext = splitext(path)[1] or '(no extension)'
+            ext_stats = by_extension.get(ext)
+            if ext_stats is None:
+                by_extension[ext] = {'count': 1, 'size': size, 'lines': lines}
+            else:
+                ext_stats['count'] += 1
+                ext_stats['size'] += size
+                ext_stats['lines'] += lines
+        return by_extension
 
     @staticmethod
     def print_statistics(stats: Dict[str, any]) -> None:
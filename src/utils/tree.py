@@ -1,5 +1,6 @@
 """ツリー表示機能"""
 import os
+import stat
 from typing import List
 
 
@@ -41,20 +42,31 @@ class TreeBuilder:
         dirs = []
         files = []
 
+        # パターンのないフィルタは常に含めるので、エントリごとの呼び出しを省く
+        ignore_filter = self.ignore_filter if self.ignore_filter.is_active() else None
+        glob_filter = self.glob_filter if self.glob_filter.is_active() else None
+
         for entry in entries:
             entry_path = os.path.join(directory, entry)
 
-            # 除外判定
-            if not self.ignore_filter.should_include(entry_path):
+            # isdir/isfileを個別に呼ばず、1回のstatで種別を判定（シンボリックリンクは辿る）
+            try:
+                st = os.stat(entry_path)
+            except (OSError, ValueError):
+                continue
+            is_dir = stat.S_ISDIR(st.st_mode)
+
+            # 除外判定（種別を渡してフィルタ内でのisdirを省く）
+            if ignore_filter is not None and not ignore_filter.should_include(entry_path, is_dir=is_dir):
                 continue
 
-            if os.path.isdir(entry_path):
+            if is_dir:
                 dirs.append(entry)
-            elif os.path.isfile(entry_path):
+            elif stat.S_ISREG(st.st_mode):
                 # GlobFilterで判定
-                if self.glob_filter.should_include(entry_path):
+                if glob_filter is None or glob_filter.should_include(entry_path, is_dir=False):
                     from core.file_scanner import FileScanner
-                    if FileScanner._is_text_file(entry_path):
+                    if FileScanner._is_text_file(entry_path, st):
                         files.append(entry)
 
         all_entries = dirs + files
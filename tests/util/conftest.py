@@ -0,0 +1,57 @@
+"""tests/util 共通のfixture"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def many_files_dir(tmp_path_factory):
+    """100個のファイルを含むディレクトリ（読み取り専用で共有）"""
+    root = tmp_path_factory.mktemp("many_files")
+    for i in range(100):
+        (root / f"file{i:03d}.txt").write_text(f"content {i}")
+    return root
+
+
+@pytest.fixture(scope="session")
+def deep_nested_dir(tmp_path_factory):
+    """50階層のネストの最深部にファイルを1つ含むディレクトリ（読み取り専用で共有）"""
+    root = tmp_path_factory.mktemp("deep_nested")
+    current = root
+    for i in range(50):
+        current = current / f"level{i}"
+    current.mkdir(parents=True)
+    (current / "deep.txt").write_text("content")
+    return root
+
+
+@pytest.fixture(scope="session")
+def unicode_names_dir(tmp_path_factory):
+    """Unicode文字を含むファイル名のディレクトリ（読み取り専用で共有）"""
+    root = tmp_path_factory.mktemp("unicode_names")
+    for name in ["日本語.txt", "中文.txt", "한국어.txt", "emoji_😀.txt"]:
+        (root / name).write_text("content")
+    return root
+
+
+@pytest.fixture(scope="session")
+def gitignore_tree(tmp_path_factory):
+    """gitignoreパターンのテスト用のディレクトリ構成（読み取り専用で共有）"""
+    root = tmp_path_factory.mktemp("gitignore_tree")
+    for directory in ["node_modules/package", "test", "src/test", "a/b/c"]:
+        (root / directory).mkdir(parents=True)
+    for name in ["node_modules/package/index.js", "a/b/c/utils.pyc", "main.pyc", "main.py"]:
+        (root / name).touch()
+    return root
+
+
+@pytest.fixture(scope="session")
+def tree_dir(tmp_path_factory):
+    """TreeBuilderのテスト用のディレクトリ構成（読み取り専用で共有）"""
+    root = tmp_path_factory.mktemp("tree")
+    (root / "src").mkdir()
+    (root / "a" / "b" / "c").mkdir(parents=True)
+    for name in ["file1.txt", "file2.txt", "file3.txt", "root.txt", "text.txt",
+                 "src/main.py", "a/b/c/deep.txt"]:
+        (root / name).write_text("content")
+    # NULを含めばバイナリと判定されるので2バイトで足りる
+    (root / "binary.bin").write_bytes(b'\x00\xff')
+    return root
\ No newline at end of file
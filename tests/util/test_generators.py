@@ -64,6 +64,26 @@ class TestTextGeneratorBasic:
         assert "# Python" in content
         assert "// JavaScript" in content
 
+    def test_display_path_is_relative_to_target_dir(self, tmp_path):
+        """ファイル見出しはターゲットディレクトリをルートとしたパス"""
+        (tmp_path / "sub").mkdir()
+        nested = tmp_path / "sub" / "a.py"
+        nested.write_text("x")
+        outside = tmp_path / "b.py"
+        outside.write_text("y")
+        file_infos = [
+            {'path': str(nested), 'size': 1, 'lines': 1},
+            {'path': str(outside), 'size': 1, 'lines': 1},
+        ]
+
+        text, _ = TextGenerator().generate(file_infos, str(tmp_path / "sub"))
+        markdown, _ = MarkdownGenerator().generate(file_infos, str(tmp_path / "sub"))
+
+        assert "--- /a.py ---" in text
+        assert "--- /../b.py ---" in text
+        assert "### `/a.py`" in markdown
+        assert "### `/../b.py`" in markdown
+
 
 class TestTextGeneratorOptions:
     """TextGenerator のオプション機能テスト"""
@@ -162,6 +182,27 @@ class TestTextGeneratorOptions:
         assert "line4" in content
         assert "line5" in content
 
+    def test_head_tail_on_large_file(self, tmp_path):
+        """読み込み単位を超えるファイルでも先頭・末尾の行を正しく取り出す"""
+        test_file = tmp_path / "large.txt"
+        lines = [f"line{i}" for i in range(20000)]
+        test_file.write_bytes("\r\n".join(lines).encode('utf-8'))
+
+        file_info = {'path': str(test_file), 'size': test_file.stat().st_size, 'lines': 20000}
+        generator = TextGenerator()
+
+        content, _ = generator.generate(
+            target_files=[file_info], target_dir=str(tmp_path), head_lines=3
+        )
+        assert "line0\nline1\nline2\n... (truncated)" in content
+        assert "line3\n" not in content
+
+        content, _ = generator.generate(
+            target_files=[file_info], target_dir=str(tmp_path), tail_lines=3
+        )
+        assert "... (truncated)\nline19997\nline19998\nline19999" in content
+        assert "line19996" not in content
+
     def test_generate_no_merge(self, tmp_path):
         """ファイル内容を含めない"""
         test_file = tmp_path / "test.txt"
@@ -380,4 +421,54 @@ class TestGeneratorErrorHandling:
         assert "[Error" in content or "```" in content
         
         captured = capsys.readouterr()
-        assert "Warning" in captured.err or "Failed" in captured.err
\ No newline at end of file
+        assert "Warning" in captured.err or "Failed" in captured.err
+
+    def test_error_among_many_files_keeps_order(self, tmp_path, capsys):
+        """並列に読み込んでもエラーを含めて元の順序で出力される"""
+        file_infos = []
+        for i in range(10):
+            path = tmp_path / f"f{i}.txt"
+            path.write_text(f"content{i}")
+            file_infos.append({'path': str(path), 'size': 8, 'lines': 1})
+        file_infos[4] = {'path': str(tmp_path / "missing.txt"), 'size': 0, 'lines': 0}
+
+        generator = TextGenerator()
+        content, stats = generator.generate(
+            target_files=file_infos,
+            target_dir=str(tmp_path)
+        )
+
+        positions = [content.index(f"content{i}") for i in range(10) if i != 4]
+        assert positions == sorted(positions)
+        assert content.index("content3") < content.index("[Error") < content.index("content5")
+
+    def test_many_files_are_not_all_submitted_at_once(self, tmp_path, monkeypatch):
+        """大量のファイルでも読み込みはワーカー数の2倍程度までしか先行しない"""
+        import generators.base as base
+        from concurrent.futures import ThreadPoolExecutor
+
+        file_infos = []
+        for i in range(200):
+            path = tmp_path / f"f{i}.txt"
+            path.write_text(f"content{i}")
+            file_infos.append({'path': str(path), 'size': 8, 'lines': 1})
+
+        submitted = []
+        original_submit = ThreadPoolExecutor.submit
+
+        def counting_submit(self, fn, *args, **kwargs):
+            submitted.append(fn)
+            return original_submit(self, fn, *args, **kwargs)
+
+        monkeypatch.setattr(ThreadPoolExecutor, "submit", counting_submit)
+
+        generator = TextGenerator()
+        contents = generator._iter_contents(file_infos)
+        first_info, load = next(contents)
+
+        assert first_info is file_infos[0]
+        assert load() == "content0"
+        assert len(submitted) <= 2 * base._MAX_READ_WORKERS + 1
+
+        assert [load() for _, load in contents] == [f"content{i}" for i in range(1, 200)]
+        assert len(submitted) == 200
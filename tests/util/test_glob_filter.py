@@ -3,6 +3,7 @@ import pytest
 import os
 from pathlib import Path
 from src.filters.glob import GlobFilter
+from src.filters.base import base_prefix, relative_path
 
 
 class TestGlobFilterBasic:
@@ -67,6 +68,14 @@ class TestGlobFilterBasic:
         
         assert filter.should_include(str(subdir))
 
+    def test_is_dir_hint_skips_filesystem_check(self, tmp_path):
+        """種別を指定した場合はファイルシステムを確認しない"""
+        filter = GlobFilter(patterns=["*.py"], base_dir=str(tmp_path))
+
+        # 存在しないパスでも指定した種別で判定する
+        assert filter.should_include(str(tmp_path / "missing"), is_dir=True)
+        assert not filter.should_include(str(tmp_path / "missing"), is_dir=False)
+
 
 class TestGlobFilterPatterns:
     """様々なGlobパターンのテスト"""
@@ -293,6 +302,29 @@ class TestGlobFilterEdgeCases:
         # 空文字列のパスは含まれない
         assert not filter.should_include("")
 
+    def test_repeated_calls_use_cache(self, tmp_path):
+        """同じパスの2回目以降の判定はキャッシュから返す"""
+        filter = GlobFilter(patterns=["*.py"], base_dir=str(tmp_path))
+        py_file = tmp_path / "test.py"
+        py_file.touch()
+
+        assert filter.should_include(str(py_file))
+        py_file.unlink()
+        # 判定済みのパスはファイルシステムを再確認しない
+        assert filter.should_include(str(py_file))
+        assert not filter.should_include(str(tmp_path / "test.js"))
+
+    def test_filter_paths_same_as_should_include(self, tmp_path):
+        """まとめて判定してもshould_includeと同じ結果を元の順序で返す"""
+        filter = GlobFilter(patterns=["src/**/*.py", "*.md"], base_dir=str(tmp_path))
+        paths = [
+            str(tmp_path / name)
+            for name in ["README.md", "src/a.py", "src/b.js", "lib/c.py", "src/d/e.py", "docs/f.md"]
+        ]
+
+        assert filter.filter_paths(paths) == [p for p in paths if filter.should_include(p)]
+        assert GlobFilter(base_dir=str(tmp_path)).filter_paths(paths) == paths
+
 
 class TestGlobFilterDebugMode:
     """デバッグモードのテスト"""
@@ -343,4 +375,25 @@ class TestGlobFilterInvalidPatterns:
         # 相対パスの解決に失敗する可能性がある
         filter = GlobFilter(patterns=["*.py"], base_dir=None)
         # エラーにならないが、動作は保証されない
-        assert filter.is_active()
\ No newline at end of file
+        assert filter.is_active()
+
+
+class TestRelativePath:
+    """相対パス変換のテスト"""
+
+    @pytest.mark.parametrize("base_dir, path", [
+        (".", "./src/main.py"),
+        (".", "./.hidden"),
+        ("src", "src/a/b.py"),
+        ("src/", "src/a.py"),
+        ("src", "src/../other.py"),
+        ("src", "src//a.py"),
+        ("src", "src/a/./b.py"),
+        ("src", "other/a.py"),
+        ("src", "src"),
+    ])
+    def test_same_result_as_relpath(self, base_dir, path):
+        """os.path.relpathと同じ結果になる"""
+        expected = os.path.relpath(path, base_dir).replace(os.sep, '/')
+
+        assert relative_path(path, base_dir, base_prefix(base_dir)) == expected
\ No newline at end of file
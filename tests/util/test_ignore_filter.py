@@ -17,6 +17,14 @@ class TestIgnoreFilterBasic:
         
         assert filter.should_include(str(test_file))
 
+    def test_empty_patterns_inactive(self, tmp_path):
+        """パターンがなければマッチャーを作らず、全て含める"""
+        filter = IgnoreFilter(patterns=[], base_dir=str(tmp_path), debug=False)
+
+        assert not filter.is_active()
+        assert filter.filter_paths(["a.log", "b.py"]) == ["a.log", "b.py"]
+        assert IgnoreFilter(patterns=[], base_dir=str(tmp_path), auto_vcs_ignore=True).is_active()
+
     def test_single_file_pattern(self, tmp_path):
         """単一ファイルの除外"""
         filter = IgnoreFilter(patterns=["test.log"], base_dir=str(tmp_path), debug=False)
@@ -107,35 +115,25 @@ class TestIgnoreFilterGitignorePatterns:
         assert not filter.should_include(str(test_utils))
         assert filter.should_include(str(main))
 
-    def test_directory_wildcard(self, tmp_path):
+    def test_directory_wildcard(self, gitignore_tree):
         """ディレクトリ内の全ファイル除外"""
-        filter = IgnoreFilter(patterns=["node_modules/"], base_dir=str(tmp_path), debug=False)
-        
-        node_modules = tmp_path / "node_modules"
-        node_modules.mkdir()
-        
+        filter = IgnoreFilter(patterns=["node_modules/"], base_dir=str(gitignore_tree), debug=False)
+
+        node_modules = gitignore_tree / "node_modules"
         package = node_modules / "package"
-        package.mkdir()
-        
         index_js = package / "index.js"
-        index_js.touch()
-        
+
         assert not filter.should_include(str(node_modules))
         assert not filter.should_include(str(package))
         assert not filter.should_include(str(index_js))
 
-    def test_recursive_pattern(self, tmp_path):
+    def test_recursive_pattern(self, gitignore_tree):
         """再帰的パターン **/test"""
-        filter = IgnoreFilter(patterns=["**/test"], base_dir=str(tmp_path), debug=False)
-        
-        test1 = tmp_path / "test"
-        test1.mkdir()
-        
-        subdir = tmp_path / "src"
-        subdir.mkdir()
-        test2 = subdir / "test"
-        test2.mkdir()
-        
+        filter = IgnoreFilter(patterns=["**/test"], base_dir=str(gitignore_tree), debug=False)
+
+        test1 = gitignore_tree / "test"
+        test2 = gitignore_tree / "src" / "test"
+
         # どちらのtestディレクトリも除外される
         assert not filter.should_include(str(test1))
         assert not filter.should_include(str(test2))
@@ -177,21 +175,26 @@ class TestIgnoreFilterGitignorePatterns:
         # !important.logは後から追加されているが、
         # pathspecの実装によっては否定が効かない可能性がある
 
-    def test_double_asterisk_pattern(self, tmp_path):
+    def test_negation_is_last_match_wins(self, tmp_path):
+        """否定パターンはそれより前のパターンだけを打ち消す（gitignoreと同じ後勝ち）"""
+        filter = IgnoreFilter(
+            patterns=["*.log", "!important*.log", "important-old.log"],
+            base_dir=str(tmp_path),
+            debug=False
+        )
+
+        assert not filter.should_include(str(tmp_path / "debug.log"))
+        assert filter.should_include(str(tmp_path / "important.log"))
+        assert not filter.should_include(str(tmp_path / "important-old.log"))
+
+    def test_double_asterisk_pattern(self, gitignore_tree):
         """ダブルアスタリスクパターン **/"""
-        filter = IgnoreFilter(patterns=["**/*.pyc"], base_dir=str(tmp_path), debug=False)
-        
-        root_pyc = tmp_path / "main.pyc"
-        root_pyc.touch()
-        
-        deep = tmp_path / "a" / "b" / "c"
-        deep.mkdir(parents=True)
-        deep_pyc = deep / "utils.pyc"
-        deep_pyc.touch()
-        
-        py_file = tmp_path / "main.py"
-        py_file.touch()
-        
+        filter = IgnoreFilter(patterns=["**/*.pyc"], base_dir=str(gitignore_tree), debug=False)
+
+        root_pyc = gitignore_tree / "main.pyc"
+        deep_pyc = gitignore_tree / "a" / "b" / "c" / "utils.pyc"
+        py_file = gitignore_tree / "main.py"
+
         assert not filter.should_include(str(root_pyc))
         assert not filter.should_include(str(deep_pyc))
         assert filter.should_include(str(py_file))
@@ -248,6 +251,38 @@ class TestIgnoreFilterVCS:
         assert filter.should_include(str(git_dir))
         assert filter.should_include(str(gitignore))
 
+    def test_auto_vcs_ignore_deduplicates_patterns(self, tmp_path):
+        """ユーザーのパターンと重複するVCSパターンは1つにまとめ、後勝ちの順序を保つ"""
+        filter = IgnoreFilter(
+            patterns=[".git/", "!.gitignore", ".gitignore"],
+            base_dir=str(tmp_path),
+            debug=False,
+            auto_vcs_ignore=True
+        )
+
+        # 重複をまとめても後勝ちなので、'!.gitignore' の後の '.gitignore' が有効
+        assert not filter.should_include(str(tmp_path / ".gitignore"))
+        assert not filter.should_include(str(tmp_path / ".git" / "config"))
+
+    def test_prunable_dirs_skip_negated_vcs_dirs(self, tmp_path):
+        """ユーザーが否定したVCSディレクトリは名前での枝刈りの対象にしない"""
+        filter = IgnoreFilter(
+            patterns=["!.svn/"],
+            base_dir=str(tmp_path),
+            debug=False,
+            auto_vcs_ignore=True
+        )
+
+        assert ".svn" not in filter.prunable_dirs
+        assert ".git" in filter.prunable_dirs
+        assert filter.should_include(str(tmp_path / ".svn"), is_dir=True)
+
+    def test_prunable_dirs_empty_without_auto_vcs_ignore(self, tmp_path):
+        """VCS自動除外が無効なら名前での枝刈りはしない"""
+        filter = IgnoreFilter(patterns=["*.log"], base_dir=str(tmp_path))
+
+        assert filter.prunable_dirs == frozenset()
+
     def test_vcs_patterns_list(self, tmp_path):
         """VCSパターンのリスト"""
         # VCS_PATTERNSが正しく定義されているか確認
@@ -309,6 +344,15 @@ class TestIgnoreFilterFileLoading:
         assert "*.log" in patterns
         assert "*.tmp" in patterns
 
+    def test_load_patterns_crlf(self, tmp_path):
+        """CRLF・CRの改行でも行ごとに読み込む"""
+        ignore_file = tmp_path / ".gitignore"
+        ignore_file.write_bytes(b"*.log\r\n# comment\r\n\r\nbuild/\r*.tmp")
+
+        patterns = IgnoreFilter.load_patterns(str(ignore_file))
+
+        assert patterns == ["*.log", "build/", "*.tmp"]
+
     def test_auto_detect_gitignore_exists(self, tmp_path):
         """.gitignoreの自動検出（存在する場合）"""
         gitignore = tmp_path / ".gitignore"
@@ -444,6 +488,52 @@ class TestIgnoreFilterEdgeCases:
         # 空パターンは何にもマッチしない
         assert filter.should_include(str(test_file))
 
+    def test_same_patterns_share_matcher(self, tmp_path):
+        """同じパターンのフィルタはベースディレクトリが違ってもマッチャーを共有する"""
+        first = IgnoreFilter(patterns=["*.log"], base_dir=str(tmp_path / "a"))
+        second = IgnoreFilter(patterns=["*.log"], base_dir=str(tmp_path / "b"))
+
+        assert first.spec is second.spec
+        assert not second.should_include(str(tmp_path / "b" / "x.log"))
+
+    def test_filter_paths_same_as_should_include(self, tmp_path):
+        """まとめて判定してもshould_includeと同じ結果を元の順序で返す"""
+        filter = IgnoreFilter(
+            patterns=["*.log", "*.tmp", "cache/", "!keep.log"],
+            base_dir=str(tmp_path),
+            debug=False
+        )
+        names = ["debug.log", "keep.log", "temp.tmp", "cache/a.py", "main.py", "src/x.log"]
+        paths = [str(tmp_path / f"d{i}" / name) for i in range(2000) for name in names]
+
+        result = filter.filter_paths(paths)
+
+        assert result == [p for p in paths if filter.should_include(p)]
+        assert len(result) == 2 * 2000
+
+    def test_is_dir_hint_skips_filesystem_check(self, tmp_path, monkeypatch):
+        """種別を指定した場合はos.path.isdirで確認しない"""
+        filter = IgnoreFilter(patterns=["build/"], base_dir=str(tmp_path), debug=False)
+
+        def fail(path):
+            raise AssertionError("os.path.isdir should not be called")
+        monkeypatch.setattr(os.path, "isdir", fail)
+
+        assert not filter.should_include(str(tmp_path / "build"), is_dir=True)
+        assert filter.should_include(str(tmp_path / "src"), is_dir=True)
+        assert filter.should_include(str(tmp_path / "main.py"), is_dir=False)
+
+    def test_repeated_calls_use_cache(self, tmp_path):
+        """同じパスの2回目以降の判定はキャッシュから返す"""
+        filter = IgnoreFilter(patterns=["build/"], base_dir=str(tmp_path), debug=False)
+        build_dir = tmp_path / "build"
+        build_dir.mkdir()
+
+        assert not filter.should_include(str(build_dir))
+        build_dir.rmdir()
+        # 判定済みのパスはファイルシステムを再確認しない
+        assert not filter.should_include(str(build_dir))
+
 
 class TestIgnoreFilterDebugMode:
     """デバッグモードのテスト"""
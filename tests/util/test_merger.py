@@ -13,18 +13,20 @@ from src.filters.glob import GlobFilter
 from src.filters.ignore import IgnoreFilter
 
 
+@pytest.fixture(scope="module")
+def merger():
+    """フィルタなしのスキャナーとテキスト形式のMerger（状態を持たないのでモジュール内で共有）"""
+    return Merger(FileScanner(filters=[], debug=False), TextGenerator())
+
+
 class TestMergerBasic:
     """Mergerの基本機能テスト"""
     
-    def test_merge_basic(self, tmp_path):
+    def test_merge_basic(self, tmp_path, merger):
         """基本的なマージ"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -37,15 +39,11 @@ class TestMergerBasic:
         assert "test.txt" in content
         assert "content" in content
 
-    def test_merge_multiple_files(self, tmp_path):
+    def test_merge_multiple_files(self, tmp_path, merger):
         """複数ファイルのマージ"""
         for i in range(3):
             (tmp_path / f"file{i}.txt").write_text(f"content {i}")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -63,15 +61,11 @@ class TestMergerBasic:
 class TestMergerStdout:
     """stdout出力のテスト"""
     
-    def test_merge_to_stdout(self, tmp_path, capsys):
+    def test_merge_to_stdout(self, tmp_path, merger, capsys):
         """stdout出力"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("hello world")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         merger.merge(
             target_dir=str(tmp_path),
             to_stdout=True,
@@ -134,15 +128,11 @@ class TestMergerWithOptions:
         content = output_file.read_text()
         assert "File List" in content or "test.txt" in content
 
-    def test_merge_with_stats(self, tmp_path):
+    def test_merge_with_stats(self, tmp_path, merger):
         """統計情報付き"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -154,15 +144,11 @@ class TestMergerWithOptions:
         content = output_file.read_text()
         assert "Statistics" in content or "Total files" in content
 
-    def test_merge_with_sanitize(self, tmp_path, capsys):
+    def test_merge_with_sanitize(self, tmp_path, merger, capsys):
         """サニタイズ付き"""
         test_file = tmp_path / "config.txt"
         test_file.write_text("email: user@example.com")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -178,15 +164,11 @@ class TestMergerWithOptions:
         # サニタイズ統計が出力される可能性
         assert "Done!" in captured.out
 
-    def test_merge_with_head_lines(self, tmp_path):
+    def test_merge_with_head_lines(self, tmp_path, merger):
         """先頭N行のみ"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("line1\nline2\nline3\nline4\nline5")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -199,15 +181,11 @@ class TestMergerWithOptions:
         assert "line1" in content
         assert "line2" in content
 
-    def test_merge_with_tail_lines(self, tmp_path):
+    def test_merge_with_tail_lines(self, tmp_path, merger):
         """末尾N行のみ"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("line1\nline2\nline3\nline4\nline5")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -220,15 +198,11 @@ class TestMergerWithOptions:
         assert "line4" in content
         assert "line5" in content
 
-    def test_merge_no_merge(self, tmp_path):
+    def test_merge_no_merge(self, tmp_path, merger):
         """ファイル内容を含めない"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("secret content")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -289,15 +263,11 @@ class TestMergerDisplayOnly:
         assert "File list:" in captured.out
         assert "test.txt" in captured.out
 
-    def test_display_only_stats(self, tmp_path, capsys):
+    def test_display_only_stats(self, tmp_path, merger, capsys):
         """統計表示のみ"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         merger.merge(
             target_dir=str(tmp_path),
             show_stats=True,
@@ -358,7 +328,7 @@ class TestMergerDisplayOnly:
 class TestMergerConfirmation:
     """確認プロンプトのテスト"""
     
-    def test_merge_with_confirmation_yes(self, tmp_path, monkeypatch):
+    def test_merge_with_confirmation_yes(self, tmp_path, merger, monkeypatch):
         """確認プロンプト - Yes"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
@@ -366,10 +336,6 @@ class TestMergerConfirmation:
         # 'yes'を入力
         monkeypatch.setattr('builtins.input', lambda _: 'yes')
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -379,7 +345,7 @@ class TestMergerConfirmation:
         
         assert output_file.exists()
 
-    def test_merge_with_confirmation_no(self, tmp_path, monkeypatch, capsys):
+    def test_merge_with_confirmation_no(self, tmp_path, merger, monkeypatch, capsys):
         """確認プロンプト - No"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
@@ -387,10 +353,6 @@ class TestMergerConfirmation:
         # 'no'を入力
         monkeypatch.setattr('builtins.input', lambda _: 'no')
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         merger.merge(
             target_dir=str(tmp_path),
@@ -455,7 +417,7 @@ class TestMergerScanStats:
 class TestMergerErrorHandling:
     """エラーハンドリングのテスト"""
     
-    def test_permission_denied(self, tmp_path, capsys):
+    def test_permission_denied(self, tmp_path, merger, capsys):
         """書き込み権限エラー"""
         import os
         if os.name == 'nt':
@@ -468,10 +430,6 @@ class TestMergerErrorHandling:
         output_file.touch()
         os.chmod(output_file, 0o444)  # 読み取り専用
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         try:
             with pytest.raises(SystemExit):
                 merger.merge(
@@ -485,7 +443,7 @@ class TestMergerErrorHandling:
         finally:
             os.chmod(output_file, 0o644)
 
-    def test_invalid_path(self, tmp_path, capsys):
+    def test_invalid_path(self, tmp_path, merger, capsys):
         """無効なパスエラー"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
@@ -495,10 +453,6 @@ class TestMergerErrorHandling:
         invalid_dir.mkdir()
         output_file = invalid_dir  # ディレクトリをファイルとして指定
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         with pytest.raises(SystemExit):
             merger.merge(
                 target_dir=str(tmp_path),
@@ -509,15 +463,11 @@ class TestMergerErrorHandling:
         captured = capsys.readouterr()
         assert "Error" in captured.err
 
-    def test_os_error_handling(self, tmp_path, capsys, monkeypatch):
+    def test_os_error_handling(self, tmp_path, merger, capsys, monkeypatch):
         """OSErrorのハンドリング"""
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
         
-        scanner = FileScanner(filters=[], debug=False)
-        generator = TextGenerator()
-        merger = Merger(scanner, generator)
-        
         output_file = tmp_path / "output.txt"
         
         # open関数をモックしてOSErrorを発生させる
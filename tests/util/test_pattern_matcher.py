@@ -0,0 +1,166 @@
+"""PatternMatcher のユニットテスト"""
+import pytest
+import pathspec
+
+from filters.pattern_matcher import PatternMatcher, compile_patterns
+
+
+class TestPatternMatcherBasic:
+    """基本的なマッチングのテスト"""
+
+    def test_empty_patterns(self):
+        """パターンなしは何にもマッチしない"""
+        matcher = PatternMatcher([])
+
+        assert not matcher.match_file("test.py")
+
+    def test_extension_pattern(self):
+        """拡張子パターン"""
+        matcher = PatternMatcher(["*.py"])
+
+        assert matcher.match_file("test.py")
+        assert matcher.match_file("src/deep/test.py")
+        assert not matcher.match_file("test.js")
+
+    def test_directory_pattern(self):
+        """ディレクトリパターン"""
+        matcher = PatternMatcher(["build/"])
+
+        assert matcher.match_file("build/output.txt")
+        assert matcher.match_file("build/")
+        assert not matcher.match_file("build")
+
+    def test_comments_and_blank_lines(self):
+        """コメントと空行は無視される"""
+        matcher = PatternMatcher(["# comment", "", "*.log"])
+
+        assert matcher.match_file("debug.log")
+        assert not matcher.match_file("# comment")
+
+    def test_anchored_prefix_prefilter(self):
+        """先頭固定のパターンだけなら前方一致しないパスは即不一致"""
+        matcher = PatternMatcher(["src/**/*.py", "/tests/*.py", "!src/skip.py"])
+
+        assert matcher.match_file("src/a/b.py")
+        assert matcher.match_file("tests/test_a.py")
+        assert not matcher.match_file("lib/a.py")
+        assert not matcher.match_file("src/skip.py")
+
+    def test_unanchored_pattern_disables_prefilter(self):
+        """どの階層にもマッチするパターンがあれば前方一致の判定はしない"""
+        matcher = PatternMatcher(["src/**/*.py", "*.md"])
+
+        assert matcher.match_file("docs/deep/README.md")
+
+    def test_invalid_pattern(self):
+        """不正なパターンは例外"""
+        with pytest.raises(Exception):
+            PatternMatcher(["!"])
+
+
+class TestPatternMatcherNegation:
+    """否定パターン（後勝ち）のテスト"""
+
+    def test_negation_after_pattern(self):
+        """後から否定すると含まれない"""
+        matcher = PatternMatcher(["*.log", "!important.log"])
+
+        assert matcher.match_file("debug.log")
+        assert not matcher.match_file("important.log")
+
+    def test_pattern_after_negation(self):
+        """否定の後に再度マッチさせると含まれる"""
+        matcher = PatternMatcher(["*.log", "!important.log", "important.*"])
+
+        assert matcher.match_file("important.log")
+
+    def test_unanchored_pattern_precedence(self):
+        """先頭固定されていないパターンも後勝ちで評価される"""
+        matcher = PatternMatcher(["!src/**", "**/"])
+
+        assert matcher.match_file("src/x/y.js")
+
+
+class TestPatternMatcherCompatibility:
+    """pathspecとの互換性のテスト"""
+
+    @pytest.mark.parametrize("patterns", [
+        ["*.py", "build/", "!keep.py"],
+        ["src/**/*.js", "/root.txt", "a/b"],
+        ["**/temp", "docs/*.md", "!docs/README.md"],
+        ["*.[oa]", "foo?", "dir/**", "!dir/keep/**"],
+        ["**/", "*", "!*.js", "x/**/y"],
+    ])
+    def test_same_result_as_pathspec(self, patterns):
+        """pathspecと同じ判定結果になる"""
+        paths = [
+            "a.py", "keep.py", "src/x/y.js", "build/out", "build", "root.txt",
+            "x/root.txt", "a/b", "a/b/c", "q/temp", "temp/z", "docs/a.md",
+            "docs/README.md", "lib.o", "fooz", "dir/keep/x", "dir/y", "x/q/y",
+        ]
+        matcher = PatternMatcher(patterns)
+        spec = pathspec.PathSpec.from_lines('gitwildmatch', patterns)
+
+        for path in paths:
+            assert matcher.match_file(path) == spec.match_file(path), path
+
+
+class TestPatternMatcherSimplePatterns:
+    """拡張子・名前・ディレクトリ名だけのパターン（正規表現を使わない判定）のテスト"""
+
+    @pytest.mark.parametrize("patterns", [
+        ["*.log", "*.tmp"],
+        ["node_modules", ".git", "*.pyc"],
+        ["build", "# comment", ""],
+        [".git/", ".svn/", ".gitignore", "node_modules/"],
+        ["build/", "*.log", "cache"],
+    ])
+    def test_same_result_as_pathspec(self, patterns):
+        """pathspecと同じ判定結果になる"""
+        paths = [
+            "a.log", "src/a.log", "x.log/inner.txt", "x.log/", "a.log.txt", ".log",
+            "node_modules", "pkg/node_modules/x.js", "node_modules/", "my_node_modules",
+            ".git/config", "a.pyc", "build", "src/build/out", "rebuild", "b.tmp",
+            ".git", "sub/.git/HEAD", ".gitignore", "x/.svn/", "build/", "a/build", "cache/",
+        ]
+        matcher = PatternMatcher(patterns)
+        spec = pathspec.PathSpec.from_lines('gitwildmatch', patterns)
+
+        assert matcher._simple
+        for path in paths:
+            assert matcher.match_file(path) == spec.match_file(path), path
+
+    @pytest.mark.parametrize("patterns", [
+        ["*.log", "!keep.log"],
+        ["/build"],
+        ["src/build/"],
+        ["*.[oa]"],
+        ["."],
+    ])
+    def test_other_patterns_use_regex(self, patterns):
+        """否定・区切り文字・メタ文字を含む場合は正規表現で判定する"""
+        assert not PatternMatcher(patterns)._simple
+
+
+class TestCompilePatterns:
+    """compile_patternsのキャッシュのテスト"""
+
+    def test_same_patterns_share_matcher(self):
+        """同じパターンの並びではコンパイル済みのマッチャーを共有する"""
+        assert compile_patterns(("*.py", "!a.py")) is compile_patterns(("*.py", "!a.py"))
+
+    def test_common_patterns_are_compiled_once(self):
+        """並びが違っても共通するパターンはコンパイル結果を共有する"""
+        first = PatternMatcher(["src/**/*.py", "docs/*.md"])
+        second = PatternMatcher(["docs/*.md", "!src/a.py", "src/**/*.py"])
+
+        assert first.spec.patterns[0] is second.spec.patterns[2]
+        assert first.spec.patterns[1] is second.spec.patterns[0]
+
+    def test_order_is_preserved(self):
+        """並び順が違えば別のマッチャー（後勝ちの結果が変わる）"""
+        first = compile_patterns(("*.py", "!a.py"))
+        second = compile_patterns(("!a.py", "*.py"))
+
+        assert not first.match_file("a.py")
+        assert second.match_file("a.py")
\ No newline at end of file
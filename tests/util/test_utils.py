@@ -10,16 +10,36 @@ from src.filters.ignore import IgnoreFilter
 from src.filters.glob import GlobFilter
 
 
+KB = 1024
+MB = KB * 1024
+GB = MB * 1024
+TB = GB * 1024
+
+
+def _file_info(path: str, size: int = 7, lines: int = 1) -> dict:
+    """スキャナーと同じ形式のファイル情報（ファイルは作らない）"""
+    return {'path': path, 'size': size, 'lines': lines}
+
+
+def _write_file_info(path: Path, content: str) -> dict:
+    """ファイルを書き込み、スキャナーと同じ形式のファイル情報を返す"""
+    path.write_text(content)
+    return {'path': str(path), 'size': path.stat().st_size, 'lines': content.count('\n') + 1}
+
+
+def _build_tree(root: str, ignore_patterns=None, glob_patterns=None) -> str:
+    """フィルタを指定してTreeBuilderでツリーを作る"""
+    ignore_filter = IgnoreFilter(ignore_patterns or [], root, debug=False)
+    glob_filter = GlobFilter(glob_patterns, root)
+    return TreeBuilder(ignore_filter, glob_filter).build(root)
+
+
 class TestTreeBuilder:
     """TreeBuilder のテスト"""
 
     def test_build_empty_directory(self, tmp_path):
         """空のディレクトリ"""
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
+        result = _build_tree(str(tmp_path))
         
         # ディレクトリ名が含まれる
         assert tmp_path.name in result or "." in result
@@ -29,72 +49,25 @@ class TestTreeBuilder:
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
         
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
+        result = _build_tree(str(tmp_path))
         
         assert "test.txt" in result
         assert "└──" in result or "├──" in result
 
-    def test_build_multiple_files(self, tmp_path):
-        """複数ファイル"""
-        file1 = tmp_path / "file1.txt"
-        file2 = tmp_path / "file2.txt"
-        file3 = tmp_path / "file3.txt"
-        
-        for f in [file1, file2, file3]:
-            f.write_text("content")
-        
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
-        
-        assert "file1.txt" in result
-        assert "file2.txt" in result
-        assert "file3.txt" in result
-
-    def test_build_nested_directories(self, tmp_path):
-        """ネストしたディレクトリ"""
-        subdir = tmp_path / "src"
-        subdir.mkdir()
-        
-        root_file = tmp_path / "root.txt"
-        sub_file = subdir / "main.py"
-        
-        root_file.write_text("content")
-        sub_file.write_text("content")
-        
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
-        
-        assert "src/" in result
-        assert "root.txt" in result
-        assert "main.py" in result
-
-    def test_build_deep_nesting(self, tmp_path):
-        """深いネスト"""
-        deep = tmp_path / "a" / "b" / "c"
-        deep.mkdir(parents=True)
-        
-        (deep / "deep.txt").write_text("content")
-        
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
-        
-        assert "a/" in result
-        assert "b/" in result
-        assert "c/" in result
-        assert "deep.txt" in result
+    @pytest.mark.parametrize("expected", [
+        # 複数ファイル
+        ["file1.txt", "file2.txt", "file3.txt"],
+        # ネストしたディレクトリ
+        ["src/", "root.txt", "main.py"],
+        # 深いネスト
+        ["a/", "b/", "c/", "deep.txt"],
+    ], ids=["multiple_files", "nested_directories", "deep_nesting"])
+    def test_build_contains(self, tree_dir, expected):
+        """ファイルとディレクトリ（末尾に '/'）がツリーに含まれる"""
+        result = _build_tree(str(tree_dir))
+
+        for name in expected:
+            assert name in result
 
     def test_build_with_ignore_filter(self, tmp_path):
         """Ignoreフィルタ適用"""
@@ -104,11 +77,7 @@ class TestTreeBuilder:
         keep.write_text("content")
         ignore.write_text("content")
         
-        ignore_filter = IgnoreFilter(["*.log"], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
+        result = _build_tree(str(tmp_path), ignore_patterns=["*.log"])
         
         assert "keep.txt" in result
         assert "ignore.log" not in result
@@ -121,39 +90,38 @@ class TestTreeBuilder:
         py_file.write_text("content")
         js_file.write_text("content")
         
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(["*.py"], str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
+        result = _build_tree(str(tmp_path), glob_patterns=["*.py"])
         
         assert "test.py" in result
         assert "test.js" not in result
 
-    def test_build_binary_files_excluded(self, tmp_path):
+    def test_build_binary_files_excluded(self, tree_dir):
         """バイナリファイルは除外される"""
-        text_file = tmp_path / "text.txt"
-        binary_file = tmp_path / "binary.bin"
-        
-        text_file.write_text("content")
-        binary_file.write_bytes(b'\x00\xFF' * 50)
-        
-        ignore_filter = IgnoreFilter([], str(tmp_path), debug=False)
-        glob_filter = GlobFilter(None, str(tmp_path))
-        builder = TreeBuilder(ignore_filter, glob_filter)
-        
-        result = builder.build(str(tmp_path))
+        result = _build_tree(str(tree_dir))
         
         assert "text.txt" in result
         # バイナリファイルはFileScanner._is_text_fileで除外される
+        assert "binary.bin" not in result
+
+    def test_build_skips_inactive_filters(self, tree_dir, monkeypatch):
+        """パターンのないフィルタはエントリごとに呼び出さない"""
+        def fail(*args, **kwargs):
+            raise AssertionError("should_include called")
+
+        monkeypatch.setattr(IgnoreFilter, "should_include", fail)
+        monkeypatch.setattr(GlobFilter, "should_include", fail)
+
+        result = _build_tree(str(tree_dir))
+
+        assert "deep.txt" in result
 
 
 class TestListBuilder:
     """ListBuilder のテスト"""
 
-    def test_build_empty_list(self, tmp_path):
+    def test_build_empty_list(self):
         """空のリスト"""
-        builder = ListBuilder(str(tmp_path))
+        builder = ListBuilder("/base")
         
         result = builder.build([])
         
@@ -206,14 +174,7 @@ class TestListBuilder:
 
     def test_build_with_stats(self, tmp_path):
         """統計情報付き"""
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("line1\nline2\nline3")
-        
-        file_info = {
-            'path': str(test_file),
-            'size': test_file.stat().st_size,
-            'lines': 3
-        }
+        file_info = _write_file_info(tmp_path / "test.txt", "line1\nline2\nline3")
         
         builder = ListBuilder(str(tmp_path))
         result = builder.build_with_stats([file_info])
@@ -235,75 +196,38 @@ class TestStatistics:
         assert stats['total_lines'] == 0
         assert stats['by_extension'] == {}
 
-    def test_calculate_single_file(self, tmp_path):
+    def test_calculate_single_file(self):
         """単一ファイル"""
-        test_file = tmp_path / "test.py"
-        test_file.write_text("line1\nline2")
-        
-        file_info = {
-            'path': str(test_file),
-            'size': test_file.stat().st_size,
-            'lines': 2
-        }
-        
-        stats = Statistics.calculate([file_info])
+        stats = Statistics.calculate([_file_info("/x/test.py", size=11, lines=2)])
         
         assert stats['total_files'] == 1
         assert stats['total_lines'] == 2
         assert stats['total_size'] > 0
         assert '.py' in stats['by_extension']
 
-    def test_calculate_multiple_files(self, tmp_path):
+    def test_calculate_multiple_files(self):
         """複数ファイル"""
-        py_file = tmp_path / "test.py"
-        js_file = tmp_path / "test.js"
-        
-        py_file.write_text("python")
-        js_file.write_text("javascript")
-        
-        file_infos = [
-            {'path': str(py_file), 'size': py_file.stat().st_size, 'lines': 1},
-            {'path': str(js_file), 'size': js_file.stat().st_size, 'lines': 1}
-        ]
-        
-        stats = Statistics.calculate(file_infos)
+        stats = Statistics.calculate([_file_info("/x/test.py"), _file_info("/x/test.js")])
         
         assert stats['total_files'] == 2
         assert stats['total_lines'] == 2
         assert '.py' in stats['by_extension']
         assert '.js' in stats['by_extension']
 
-    def test_calculate_by_extension(self, tmp_path):
+    def test_calculate_by_extension(self):
         """拡張子別の統計"""
-        files = {
-            'file1.py': 'python1',
-            'file2.py': 'python2',
-            'file3.js': 'javascript'
-        }
-        
-        file_infos = []
-        for name, content in files.items():
-            f = tmp_path / name
-            f.write_text(content)
-            file_infos.append({
-                'path': str(f),
-                'size': f.stat().st_size,
-                'lines': 1
-            })
+        stats = Statistics.calculate([
+            _file_info("/x/file1.py", size=7),
+            _file_info("/x/file2.py", size=7),
+            _file_info("/x/file3.js", size=10)
+        ])
         
-        stats = Statistics.calculate(file_infos)
-        
-        assert stats['by_extension']['.py']['count'] == 2
-        assert stats['by_extension']['.js']['count'] == 1
+        assert stats['by_extension']['.py'] == {'count': 2, 'lines': 2, 'size': 14}
+        assert stats['by_extension']['.js'] == {'count': 1, 'lines': 1, 'size': 10}
 
-    def test_calculate_no_extension(self, tmp_path):
+    def test_calculate_no_extension(self):
         """拡張子なしファイル"""
-        no_ext = tmp_path / "Makefile"
-        no_ext.write_text("content")
-        
-        file_info = {'path': str(no_ext), 'size': 7, 'lines': 1}
-        
-        stats = Statistics.calculate([file_info])
+        stats = Statistics.calculate([_file_info("/x/Makefile")])
         
         assert '(no extension)' in stats['by_extension']
 
@@ -332,67 +256,54 @@ class TestStatistics:
 class TestLanguageMapper:
     """LanguageMapper のテスト"""
 
-    def test_get_language_python(self):
-        """Python"""
-        assert LanguageMapper.get_language("test.py") == "python"
-        assert LanguageMapper.get_language("test.pyi") == "python"
-        assert LanguageMapper.get_language("test.pyw") == "python"
-
-    def test_get_language_javascript(self):
-        """JavaScript/TypeScript"""
-        assert LanguageMapper.get_language("test.js") == "javascript"
-        assert LanguageMapper.get_language("test.jsx") == "jsx"
-        assert LanguageMapper.get_language("test.ts") == "typescript"
-        assert LanguageMapper.get_language("test.tsx") == "tsx"
-        assert LanguageMapper.get_language("test.mjs") == "javascript"
-        assert LanguageMapper.get_language("test.cjs") == "javascript"
-
-    def test_get_language_web(self):
-        """Web関連"""
-        assert LanguageMapper.get_language("test.html") == "html"
-        assert LanguageMapper.get_language("test.css") == "css"
-        assert LanguageMapper.get_language("test.scss") == "scss"
-        assert LanguageMapper.get_language("test.sass") == "sass"
-
-    def test_get_language_config(self):
-        """設定ファイル"""
-        assert LanguageMapper.get_language("test.json") == "json"
-        assert LanguageMapper.get_language("test.yaml") == "yaml"
-        assert LanguageMapper.get_language("test.yml") == "yaml"
-        assert LanguageMapper.get_language("test.toml") == "toml"
-        assert LanguageMapper.get_language("test.ini") == "ini"
-
-    def test_get_language_shell(self):
-        """シェルスクリプト"""
-        assert LanguageMapper.get_language("test.sh") == "bash"
-        assert LanguageMapper.get_language("test.bash") == "bash"
-        assert LanguageMapper.get_language("test.zsh") == "zsh"
-
-    def test_get_language_compiled(self):
-        """コンパイル言語"""
-        assert LanguageMapper.get_language("test.c") == "c"
-        assert LanguageMapper.get_language("test.cpp") == "cpp"
-        assert LanguageMapper.get_language("test.java") == "java"
-        assert LanguageMapper.get_language("test.go") == "go"
-        assert LanguageMapper.get_language("test.rs") == "rust"
-
-    def test_get_language_special_files(self):
-        """特殊ファイル名"""
-        assert LanguageMapper.get_language("Dockerfile") == "dockerfile"
-        assert LanguageMapper.get_language("Makefile") == "makefile"
-        assert LanguageMapper.get_language("Gemfile") == "ruby"
-        assert LanguageMapper.get_language(".bashrc") == "bash"
-        assert LanguageMapper.get_language(".gitignore") == "text"
-
-    def test_get_language_case_insensitive(self):
-        """大文字小文字を区別しない"""
-        assert LanguageMapper.get_language("DOCKERFILE") == "dockerfile"
-        assert LanguageMapper.get_language("MAKEFILE") == "makefile"
-
-    def test_get_language_unknown_extension(self):
-        """未知の拡張子"""
-        result = LanguageMapper.get_language("test.xyz")
-        assert result == "xyz"
+    @pytest.mark.parametrize("file_path, expected", [
+        # Python
+        ("test.py", "python"),
+        ("test.pyi", "python"),
+        ("test.pyw", "python"),
+        # JavaScript/TypeScript
+        ("test.js", "javascript"),
+        ("test.jsx", "jsx"),
+        ("test.ts", "typescript"),
+        ("test.tsx", "tsx"),
+        ("test.mjs", "javascript"),
+        ("test.cjs", "javascript"),
+        # Web関連
+        ("test.html", "html"),
+        ("test.css", "css"),
+        ("test.scss", "scss"),
+        ("test.sass", "sass"),
+        # 設定ファイル
+        ("test.json", "json"),
+        ("test.yaml", "yaml"),
+        ("test.yml", "yaml"),
+        ("test.toml", "toml"),
+        ("test.ini", "ini"),
+        # シェルスクリプト
+        ("test.sh", "bash"),
+        ("test.bash", "bash"),
+        ("test.zsh", "zsh"),
+        # コンパイル言語
+        ("test.c", "c"),
+        ("test.cpp", "cpp"),
+        ("test.java", "java"),
+        ("test.go", "go"),
+        ("test.rs", "rust"),
+        # 特殊ファイル名
+        ("Dockerfile", "dockerfile"),
+        ("Makefile", "makefile"),
+        ("Gemfile", "ruby"),
+        (".bashrc", "bash"),
+        (".gitignore", "text"),
+        # 大文字小文字を区別しない
+        ("DOCKERFILE", "dockerfile"),
+        ("MAKEFILE", "makefile"),
+        # 未知の拡張子
+        ("test.xyz", "xyz"),
+    ])
+    def test_get_language(self, file_path, expected):
+        """拡張子・特殊ファイル名（大文字小文字を区別しない）・未知の拡張子"""
+        assert LanguageMapper.get_language(file_path) == expected
 
     def test_get_language_no_extension(self):
         """拡張子なし"""
@@ -400,80 +311,68 @@ class TestLanguageMapper:
         # 特殊ファイルでなければ 'text' が返る
         assert result in ["text", ""]
 
+    def test_get_language_ignores_directory(self):
+        """ディレクトリ名のドットや大文字小文字は判定に影響しない"""
+        assert LanguageMapper.get_language("src.d/Main.PY") == "python"
+        assert LanguageMapper.get_language("pkg.v2/Makefile") == "makefile"
+        assert LanguageMapper.get_language("a.b/README") == "text"
+
+    def test_mappings_are_read_only(self):
+        """マッピングは変更できない（判定結果をキャッシュしているため）"""
+        with pytest.raises(TypeError):
+            LanguageMapper.LANGUAGE_MAP['.xyz'] = 'xyz'
+
 
 class TestFormatUtils:
     """format_utils のテスト"""
 
-    def test_parse_size_bytes(self):
-        """バイト単位"""
-        assert parse_size("100B") == 100
-        assert parse_size("100 B") == 100
-
-    def test_parse_size_kilobytes(self):
-        """キロバイト単位"""
-        assert parse_size("1K") == 1024
-        assert parse_size("1KB") == 1024
-        assert parse_size("2K") == 2048
-
-    def test_parse_size_megabytes(self):
-        """メガバイト単位"""
-        assert parse_size("1M") == 1024 * 1024
-        assert parse_size("1MB") == 1024 * 1024
-        assert parse_size("2.5M") == int(2.5 * 1024 * 1024)
-
-    def test_parse_size_gigabytes(self):
-        """ギガバイト単位"""
-        assert parse_size("1G") == 1024 * 1024 * 1024
-        assert parse_size("1GB") == 1024 * 1024 * 1024
-
-    def test_parse_size_with_spaces(self):
-        """スペース付き"""
-        assert parse_size("10 M") == 10 * 1024 * 1024
-        assert parse_size("  5  KB  ") == 5 * 1024
-
-    def test_parse_size_case_insensitive(self):
-        """大文字小文字を区別しない"""
-        assert parse_size("1m") == 1024 * 1024
-        assert parse_size("1Mb") == 1024 * 1024
-
-    def test_parse_size_invalid_format(self):
+    @pytest.mark.parametrize("size_str, expected", [
+        # バイト単位
+        ("100B", 100),
+        ("100 B", 100),
+        # キロバイト単位
+        ("1K", KB),
+        ("1KB", KB),
+        ("2K", 2 * KB),
+        # メガバイト単位
+        ("1M", MB),
+        ("1MB", MB),
+        ("2.5M", int(2.5 * MB)),
+        # ギガバイト単位
+        ("1G", GB),
+        ("1GB", GB),
+        # スペース付き
+        ("10 M", 10 * MB),
+        ("  5  KB  ", 5 * KB),
+        # 大文字小文字を区別しない
+        ("1m", MB),
+        ("1Mb", MB),
+    ])
+    def test_parse_size(self, size_str, expected):
+        """単位付きのサイズ文字列をバイト数に変換"""
+        assert parse_size(size_str) == expected
+
+    @pytest.mark.parametrize("size_str", ["invalid", "10X", "abc"])
+    def test_parse_size_invalid_format(self, size_str):
         """無効な形式"""
         with pytest.raises(ValueError):
-            parse_size("invalid")
-        
-        with pytest.raises(ValueError):
-            parse_size("10X")
-        
-        with pytest.raises(ValueError):
-            parse_size("abc")
-
-    def test_format_size_bytes(self):
-        """バイト表示"""
-        assert format_size(100) == "100.0 B"
-        assert format_size(512) == "512.0 B"
-
-    def test_format_size_kilobytes(self):
-        """キロバイト表示"""
-        assert format_size(1024) == "1.0 KB"
-        assert format_size(2048) == "2.0 KB"
-        assert format_size(1536) == "1.5 KB"
-
-    def test_format_size_megabytes(self):
-        """メガバイト表示"""
-        assert format_size(1024 * 1024) == "1.0 MB"
-        assert format_size(2 * 1024 * 1024) == "2.0 MB"
-
-    def test_format_size_gigabytes(self):
-        """ギガバイト表示"""
-        assert format_size(1024 * 1024 * 1024) == "1.0 GB"
-
-    def test_format_size_terabytes(self):
-        """テラバイト表示"""
-        assert format_size(1024 * 1024 * 1024 * 1024) == "1.0 TB"
-
-    def test_format_size_zero(self):
-        """ゼロバイト"""
-        assert format_size(0) == "0.0 B"
+            parse_size(size_str)
+
+    @pytest.mark.parametrize("size, expected", [
+        (0, "0.0 B"),
+        (100, "100.0 B"),
+        (512, "512.0 B"),
+        (KB, "1.0 KB"),
+        (2 * KB, "2.0 KB"),
+        (1536, "1.5 KB"),
+        (MB, "1.0 MB"),
+        (2 * MB, "2.0 MB"),
+        (GB, "1.0 GB"),
+        (TB, "1.0 TB"),
+    ])
+    def test_format_size(self, size, expected):
+        """バイト数を単位付きで表示"""
+        assert format_size(size) == expected
 
     def test_parse_and_format_roundtrip(self):
         """変換の往復"""
@@ -482,4 +381,15 @@ class TestFormatUtils:
         formatted = format_size(parsed)
         
         assert "1.5" in formatted
-        assert "MB" in formatted
\ No newline at end of file
+        assert "MB" in formatted
+
+    @pytest.mark.parametrize("size", [
+        0, 1, 100, 1023, KB, 1536, 10 * KB + 100, MB - 1, MB,
+        int(2.5 * MB), 999 * MB, GB, 5 * GB + 123456789, TB - 1,
+    ])
+    def test_format_and_parse_roundtrip(self, size):
+        """表示した文字列を読み戻すと、小数1桁の丸め誤差の範囲で元のサイズに戻る"""
+        formatted = format_size(size)
+        unit = {'B': 1, 'KB': KB, 'MB': MB, 'GB': GB}[formatted.split()[1]]
+
+        assert abs(parse_size(formatted) - size) <= unit * 0.05 + 1
\ No newline at end of file